@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do pipeline de vagas.
+- graficos: tempo por grafico com figura nova (plotar_taxa_vagas) vs figura reaproveitada (RenderizadorGrafico)
+  e, com --jobs N, vs pool de processos (PoolGraficos)
+- perfis: tempo por grafico e tamanho medio do arquivo em cada perfil de render
+- importacao: tempo de import do script e tempo ate o menu de abas, em processos novos,
+  conferindo que pandas/matplotlib nao foram carregados ate ali
+- escala: gera XLSX sinteticos no layout da Eurostat em varios tamanhos (sintetico_vagas) e mede
+  cada etapa do modo lote (medicao_vagas) com e sem cache; grava o resultado em benchmarks/ e
+  compara com um resultado anterior (--comparar)
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import gerar_grafico_vagas as vagas
+from graficos_vagas import PERFIS_RENDER, PoolGraficos, RenderizadorGrafico, caminho_grafico, iniciar_processo_grafico
+from medicao_vagas import medir_etapas
+from sintetico_vagas import TamanhoSintetico, gerar_xlsx_sintetico, ler_tamanho
+
+
+# Diretorio dos resultados do benchmark de escala (um JSON por execucao, para comparar versoes).
+DIRETORIO_RESULTADOS = Path("benchmarks")
+# Tamanhos padrao do benchmark de escala: abas x geos x trimestres.
+TAMANHOS_PADRAO = ("10x40x12", "50x40x24", "200x40x40")
+# fria = sem cache de abas nem graficos; cache = a mesma execucao de novo (--forcar), com tudo ja gravado.
+PASSAGENS = ("fria", "cache")
+
+
+def _cronometrar(tarefas: List[Callable[[], object]]) -> List[float]:
+    tempos = []
+    for tarefa in tarefas:
+        inicio = time.perf_counter()
+        tarefa()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def _imprimir_tempos(nome: str, tempos: List[float]) -> None:
+    print(
+        f"  {nome:<22} {len(tempos):4d} graficos | media {statistics.mean(tempos) * 1000:7.1f} ms"
+        f" | mediana {statistics.median(tempos) * 1000:7.1f} ms | total {sum(tempos):6.2f}s"
+    )
+
+
+def _abas_para_grafico(caminho_excel: Path, limite_abas: int | None) -> List[Tuple[str, object, List[str], List[str]]]:
+    """(aba, tabela, ordem dos trimestres, geos padrao presentes) das abas que tem grafico."""
+    abas = []
+    for nome_aba in vagas.listar_nomes_abas(caminho_excel):
+        dados, ordem, _ = vagas.carregar_tabela_vagas(caminho_excel, nome_aba)
+        paises = [geo for geo in vagas.PAISES_PADRAO if geo in set(dados["geo"].unique())]
+        if paises:
+            abas.append((nome_aba, dados, ordem, paises))
+        if limite_abas is not None and len(abas) >= limite_abas:
+            break
+    return abas
+
+
+def benchmark_graficos(caminho_excel: Path, limite_abas: int | None = None, jobs: int = 1) -> Dict[str, List[float]]:
+    """Mede o tempo por grafico nos modos de renderizacao, com as mesmas abas."""
+    abas = _abas_para_grafico(caminho_excel, limite_abas)
+
+    resultados: Dict[str, List[float]] = {}
+    with tempfile.TemporaryDirectory() as temporario:
+        destino = Path(temporario)
+        # Cada modo grava em um subdiretorio proprio para nao cair no atalho de "PNG sem alteracoes".
+        resultados["figura nova"] = _cronometrar(
+            [
+                lambda aba=aba: vagas.plotar_taxa_vagas(
+                    aba[1], aba[2], aba[3], aba[0], destino / "nova" / f"{aba[0]}.png"
+                )
+                for aba in abas
+            ]
+        )
+        with RenderizadorGrafico() as renderizador:
+            resultados["figura reaproveitada"] = _cronometrar(
+                [
+                    lambda aba=aba: vagas.plotar_taxa_vagas(
+                        aba[1], aba[2], aba[3], aba[0], destino / "reaproveitada" / f"{aba[0]}.png", renderizador
+                    )
+                    for aba in abas
+                ]
+            )
+        if jobs > 1:
+            # No pool o que importa e o tempo de parede do lote inteiro, dividido por grafico.
+            with ProcessPoolExecutor(max_workers=jobs, initializer=iniciar_processo_grafico) as executor:
+                pool = PoolGraficos(executor)
+                inicio = time.perf_counter()
+                for nome_aba, dados, ordem, paises in abas:
+                    vagas.plotar_taxa_vagas(dados, ordem, paises, nome_aba, destino / "pool" / f"{nome_aba}.png", pool)
+                desenhos = pool.concluir()
+                parede = time.perf_counter() - inicio
+            erros = [erro for erro in desenhos.values() if isinstance(erro, BaseException)]
+            if erros:
+                raise SystemExit(f"Falha ao desenhar no pool: {erros[0]}")
+            resultados[f"pool ({jobs} processos)"] = [parede / len(desenhos)] * len(desenhos)
+
+    print(f"\nTempo por grafico ({len(abas)} abas de {caminho_excel})")
+    for nome, tempos in resultados.items():
+        _imprimir_tempos(nome, tempos)
+    return resultados
+
+
+def benchmark_perfis(caminho_excel: Path, limite_abas: int | None = 10) -> Dict[str, Tuple[List[float], List[int]]]:
+    """Mede tempo por grafico e tamanho do arquivo em cada perfil de render (figura reaproveitada)."""
+    abas = _abas_para_grafico(caminho_excel, limite_abas)
+    resultados: Dict[str, Tuple[List[float], List[int]]] = {}
+    with tempfile.TemporaryDirectory() as temporario:
+        for perfil in PERFIS_RENDER:
+            destino = Path(temporario) / perfil
+            arquivos = [caminho_grafico(destino, vagas.slugificar(aba[0]), perfil) for aba in abas]
+            with RenderizadorGrafico(perfil) as renderizador:
+                tempos = _cronometrar(
+                    [
+                        lambda aba=aba, arquivo=arquivo: vagas.plotar_taxa_vagas(
+                            aba[1], aba[2], aba[3], aba[0], arquivo, renderizador
+                        )
+                        for aba, arquivo in zip(abas, arquivos)
+                    ]
+                )
+            resultados[perfil] = (tempos, [arquivo.stat().st_size for arquivo in arquivos])
+
+    print(f"\nPerfis de render ({len(abas)} abas de {caminho_excel})")
+    for perfil, (tempos, tamanhos) in resultados.items():
+        dados_perfil = PERFIS_RENDER[perfil]
+        print(
+            f"  {perfil:<11} {dados_perfil.formato:<3} {dados_perfil.dpi:4d} dpi"
+            f" | media {statistics.mean(tempos) * 1000:7.1f} ms"
+            f" | arquivo medio {statistics.mean(tamanhos) / 1024:7.1f} KB"
+        )
+    return resultados
+
+
+# Roda em um processo novo: mede o import e a listagem do menu e informa as bibliotecas pesadas ja carregadas.
+_CODIGO_MENU = """
+import json, sys, time
+inicio = time.perf_counter()
+import gerar_grafico_vagas
+importado = time.perf_counter()
+gerar_grafico_vagas.listar_abas_excel(gerar_grafico_vagas.Path(sys.argv[1]))
+menu = time.perf_counter()
+print(json.dumps({
+    "import": importado - inicio,
+    "menu": menu - inicio,
+    "carregadas": [nome for nome in ("pandas", "matplotlib") if nome in sys.modules],
+}))
+"""
+
+
+def benchmark_importacao(caminho_excel: Path, repeticoes: int = 5) -> Dict[str, List[float]]:
+    """Mede import e tempo ate o menu (catalogo ja salvo) em processos Python novos."""
+    diretorio_scripts = Path(__file__).resolve().parent
+    resultados: Dict[str, List[float]] = {"import do script": [], "ate o menu": []}
+    carregadas: List[str] = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", _CODIGO_MENU, str(caminho_excel.resolve())],
+            cwd=diretorio_scripts,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        medida = json.loads(saida.stdout)
+        resultados["import do script"].append(medida["import"])
+        resultados["ate o menu"].append(medida["menu"])
+        carregadas = medida["carregadas"]
+
+    print(f"\nTempo ate o menu ({repeticoes} processos novos)")
+    for nome, tempos in resultados.items():
+        print(
+            f"  {nome:<22} media {statistics.mean(tempos) * 1000:7.1f} ms"
+            f" | mediana {statistics.median(tempos) * 1000:7.1f} ms"
+        )
+    print(f"  bibliotecas pesadas carregadas ate o menu: {', '.join(carregadas) if carregadas else 'nenhuma'}")
+    return resultados
+
+
+def _revisao_git() -> str:
+    try:
+        saida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-git"
+    return saida.stdout.strip()
+
+
+def _ambiente() -> Dict[str, object]:
+    import importlib.metadata
+
+    ambiente: Dict[str, object] = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    for biblioteca in ("numpy", "pandas", "matplotlib"):
+        ambiente[biblioteca] = importlib.metadata.version(biblioteca)
+    return ambiente
+
+
+def _imprimir_escala(rotulo: str, medida: Dict) -> None:
+    fria, cache = (medida["passagens"][passagem] for passagem in PASSAGENS)
+    print(
+        f"\nEscala {rotulo}: {medida['arquivo_bytes'] / 1024:.0f} KB, gerado em {medida['geracao_s']:.2f}s"
+    )
+    print(f"  {'etapa':<11} {'chamadas':>8} {'fria':>9} {'cache':>9} {'pico mem.':>10}")
+    for etapa, dados in fria["etapas"].items():
+        pico = dados["pico_memoria_bytes"]
+        pico_texto = f"{pico / 2**20:7.1f} MB" if pico is not None else "         -"
+        segundos_cache = cache["etapas"].get(etapa, {}).get("parede_s", 0.0)
+        print(f"  {etapa:<11} {dados['chamadas']:>8d} {dados['parede_s']:>8.3f}s {segundos_cache:>8.3f}s {pico_texto}")
+    print(f"  {'total':<11} {'':>8} {fria['total_s']:>8.3f}s {cache['total_s']:>8.3f}s")
+
+
+def _comparar_escala(atual: Dict, anterior: Dict, origem: Path) -> None:
+    """Imprime a variacao do tempo de parede por tamanho, passagem e etapa em relacao a um resultado anterior."""
+    print(f"\nComparacao com {origem} (revisao {anterior.get('revisao')}, {anterior.get('data')})")
+    diferencas = [
+        chave
+        for chave in set(atual["ambiente"]) | set(anterior.get("ambiente", {}))
+        if atual["ambiente"].get(chave) != anterior.get("ambiente", {}).get(chave)
+    ]
+    diferencas += [
+        f"parametro {chave}"
+        for chave in atual["parametros"]
+        if atual["parametros"][chave] != anterior.get("parametros", {}).get(chave)
+    ]
+    if diferencas:
+        print(f"  Aviso: ambiente/parametros diferentes ({', '.join(sorted(diferencas))}); compare com cuidado.")
+    comuns = [rotulo for rotulo in atual["tamanhos"] if rotulo in anterior.get("tamanhos", {})]
+    if not comuns:
+        print("  Nenhum tamanho em comum.")
+        return
+    for rotulo in comuns:
+        for passagem in PASSAGENS:
+            novo = atual["tamanhos"][rotulo]["passagens"][passagem]
+            velho = anterior["tamanhos"][rotulo]["passagens"].get(passagem)
+            if velho is None:
+                continue
+            linhas = [
+                (etapa, dados["parede_s"], velho["etapas"].get(etapa, {}).get("parede_s"))
+                for etapa, dados in novo["etapas"].items()
+            ]
+            linhas.append(("total", novo["total_s"], velho["total_s"]))
+            for etapa, segundos, segundos_antes in linhas:
+                if not segundos_antes:
+                    continue
+                variacao = (segundos - segundos_antes) / segundos_antes * 100
+                print(
+                    f"  {rotulo:<12} {passagem:<5} {etapa:<11}"
+                    f" {segundos_antes:8.3f}s -> {segundos:8.3f}s {variacao:+7.1f}%"
+                )
+
+
+def benchmark_escala(
+    tamanhos: Sequence[TamanhoSintetico],
+    perfil: str = "previa",
+    semente: int = 0,
+    memoria: bool = False,
+    caminho_saida: Path | None = None,
+    comparar: Path | None = None,
+) -> Dict:
+    """
+    Para cada tamanho, gera o XLSX sintetico e roda catalogo + modo lote duas vezes (fria e com cache),
+    medindo cada etapa. Grava o resultado em JSON (padrao: benchmarks/escala_<data>_<revisao>.json).
+    """
+    revisao = _revisao_git()
+    resultado: Dict = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revisao": revisao,
+        "ambiente": _ambiente(),
+        "parametros": {"perfil": perfil, "semente": semente, "memoria": memoria},
+        "tamanhos": {},
+    }
+    # Imports pesados e backend Agg antes de medir, para o primeiro tamanho nao pagar por eles.
+    import pandas  # noqa: F401
+
+    iniciar_processo_grafico()
+    with tempfile.TemporaryDirectory() as temporario:
+        for tamanho in tamanhos:
+            base = Path(temporario) / tamanho.rotulo()
+            caminho_excel = base / "job_vacancies.xlsx"
+            inicio = time.perf_counter()
+            gerar_xlsx_sintetico(caminho_excel, tamanho, semente)
+            medida: Dict = {
+                "geracao_s": time.perf_counter() - inicio,
+                "arquivo_bytes": caminho_excel.stat().st_size,
+                "passagens": {},
+            }
+            for passagem in PASSAGENS:
+                # O resumo do lote e a tabela da medicao saem no stdout; aqui so interessam as medidas.
+                with contextlib.redirect_stdout(io.StringIO()), medir_etapas(memoria=memoria) as medidor:
+                    vagas.listar_abas_excel(caminho_excel, usar_catalogo=False)
+                    resultados = vagas.fluxo_lote(
+                        caminho_excel,
+                        diretorio_cache=base / ".cache",
+                        forcar=True,
+                        perfil=perfil,
+                        diretorio_tabelas=base / "PowerBI",
+                        diretorio_graficos=base / "plots",
+                    )
+                erros = [(aba, status) for aba, status, _ in resultados if status.startswith("erro")]
+                if erros:
+                    raise SystemExit(f"Falha na aba {erros[0][0]} ({tamanho.rotulo()}): {erros[0][1]}")
+                medida["passagens"][passagem] = {"total_s": medidor.duracao, "etapas": medidor.resumo()}
+            resultado["tamanhos"][tamanho.rotulo()] = medida
+            _imprimir_escala(tamanho.rotulo(), medida)
+
+    if caminho_saida is None:
+        caminho_saida = DIRETORIO_RESULTADOS / f"escala_{time.strftime('%Y%m%d-%H%M%S')}_{revisao}.json"
+    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+    caminho_saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultado salvo em {caminho_saida}")
+    if comparar is not None:
+        _comparar_escala(resultado, json.loads(comparar.read_text(encoding="utf-8")), comparar)
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline de vagas.")
+    parser.add_argument("--arquivo", type=Path, default=vagas.ARQUIVO_PADRAO, help="XLSX da Eurostat.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    graficos = subparsers.add_parser("graficos", help="Tempo por grafico: figura nova vs reaproveitada.")
+    graficos.add_argument("--abas", type=int, default=None, metavar="N", help="Limita o numero de abas medidas.")
+    graficos.add_argument("--jobs", type=int, default=1, metavar="N", help="Tambem mede o pool com N processos.")
+    perfis = subparsers.add_parser("perfis", help="Tempo e tamanho do arquivo em cada perfil de render.")
+    perfis.add_argument("--abas", type=int, default=10, metavar="N", help="Numero de abas medidas (padrao: 10).")
+    importacao = subparsers.add_parser("importacao", help="Tempo de import e tempo ate o menu de abas.")
+    importacao.add_argument("--repeticoes", type=int, default=5, metavar="N", help="Processos medidos (padrao: 5).")
+    escala = subparsers.add_parser("escala", help="Etapas do modo lote em XLSX sinteticos de varios tamanhos.")
+    escala.add_argument(
+        "--tamanhos",
+        type=ler_tamanho,
+        nargs="+",
+        default=[ler_tamanho(texto) for texto in TAMANHOS_PADRAO],
+        metavar="AxGxT",
+        help=f"Abas x geos x trimestres (padrao: {' '.join(TAMANHOS_PADRAO)}).",
+    )
+    escala.add_argument(
+        "--perfil", choices=list(PERFIS_RENDER), default="previa", help="Perfil dos graficos (padrao: previa)."
+    )
+    escala.add_argument("--semente", type=int, default=0, help="Semente do gerador sintetico (padrao: 0).")
+    escala.add_argument(
+        "--memoria", action="store_true", help="Mede tambem o pico de memoria (tracemalloc, mais lento)."
+    )
+    escala.add_argument(
+        "--saida",
+        type=Path,
+        help=f"JSON do resultado (padrao: {DIRETORIO_RESULTADOS}/escala_<data>_<revisao>.json).",
+    )
+    escala.add_argument("--comparar", type=Path, metavar="JSON", help="Resultado anterior para comparar.")
+    args = parser.parse_args()
+
+    if args.comando == "graficos":
+        benchmark_graficos(args.arquivo, args.abas, args.jobs)
+    elif args.comando == "perfis":
+        benchmark_perfis(args.arquivo, args.abas)
+    elif args.comando == "importacao":
+        benchmark_importacao(args.arquivo, args.repeticoes)
+    elif args.comando == "escala":
+        benchmark_escala(args.tamanhos, args.perfil, args.semente, args.memoria, args.saida, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Cache em disco das abas ja lidas (diretorio .cache/ por padrao).
+- Cada entrada e um .npz com a MatrizAba (geos, trimestres, valores, area)
+- A chave combina o caminho do XLSX, o hash SHA-256 do conteudo, o nome da aba e as linhas de cabecalho/dados
+- Quando o XLSX muda, as entradas antigas do mesmo caminho sao apagadas
+- O diretorio tem tamanho limitado: as entradas menos usadas saem primeiro
+
+Tambem guarda o catalogo de abas (nome + area C7) em um JSON ao lado do XLSX,
+para o menu interativo aparecer sem abrir o workbook, e o manifesto do modo lote
+(impressao digital de cada aba + hash dos arquivos gerados) usado na reconstrucao incremental.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from leitor_xlsx import MatrizAba
+
+
+# Diretorio e limite padrao do cache.
+DIRETORIO_CACHE = Path(".cache")
+LIMITE_CACHE_BYTES = 256 * 1024 * 1024
+# Mude a versao quando o formato da MatrizAba ou do parser mudar.
+VERSAO_CACHE = 2
+
+
+@functools.lru_cache(maxsize=32)
+def _hash_arquivo(caminho: str, tamanho: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def impressao_digital_arquivo(caminho: Path) -> str:
+    """Hash SHA-256 do arquivo, recalculado apenas se tamanho ou mtime mudarem."""
+    info = caminho.stat()
+    return _hash_arquivo(str(caminho.resolve()), info.st_size, info.st_mtime_ns)
+
+
+def _prefixo_entradas(caminho_excel: Path) -> str:
+    """Prefixo das entradas de um XLSX: nome + hash do caminho resolvido (arquivos homonimos em outras pastas)."""
+    hash_caminho = hashlib.sha1(str(caminho_excel.resolve()).encode("utf-8")).hexdigest()[:8]
+    return f"{caminho_excel.stem}-{hash_caminho}-"
+
+
+def _caminho_entrada(
+    diretorio: Path,
+    caminho_excel: Path,
+    nome_aba: str,
+    linha_cabecalho: int,
+    linha_inicio_dados: int,
+) -> Tuple[Path, str]:
+    hash_arquivo = impressao_digital_arquivo(caminho_excel)[:16]
+    chave_aba = f"{VERSAO_CACHE}|{nome_aba}|{linha_cabecalho}|{linha_inicio_dados}"
+    hash_aba = hashlib.sha1(chave_aba.encode("utf-8")).hexdigest()[:12]
+    return diretorio / f"{_prefixo_entradas(caminho_excel)}{hash_arquivo}-{hash_aba}.npz", hash_arquivo
+
+
+def _entrada_temporaria(entrada: Path) -> bool:
+    """Arquivo .tmp.npz que outro processo ainda esta gravando."""
+    return entrada.name.endswith(".tmp.npz")
+
+
+def carregar_matriz_cache(
+    diretorio: Path,
+    caminho_excel: Path,
+    nome_aba: str,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+) -> MatrizAba | None:
+    """Retorna a MatrizAba guardada no cache ou None se nao houver entrada valida."""
+    entrada, _ = _caminho_entrada(diretorio, caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados)
+    try:
+        with np.load(entrada, allow_pickle=False) as dados:
+            area = dados["area"]
+            matriz = MatrizAba(
+                geos=dados["geos"].tolist(),
+                trimestres=dados["trimestres"].tolist(),
+                valores=dados["valores"],
+                area=str(area[0]) if area.size else None,
+            )
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    # Marca a entrada como usada recentemente para a politica de remocao; se outro processo
+    # acabou de remove-la (limitar_cache), a matriz ja lida continua valida.
+    try:
+        os.utime(entrada)
+    except OSError:
+        pass
+    return matriz
+
+
+def salvar_matriz_cache(
+    diretorio: Path,
+    caminho_excel: Path,
+    nome_aba: str,
+    matriz: MatrizAba,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    limite_bytes: int = LIMITE_CACHE_BYTES,
+) -> Path:
+    """Grava a MatrizAba no cache, invalida versoes antigas do XLSX e aplica o limite de tamanho."""
+    entrada, hash_arquivo = _caminho_entrada(
+        diretorio, caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados
+    )
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    # Entradas do mesmo caminho com outro hash pertencem a uma versao anterior do arquivo;
+    # XLSX com o mesmo nome em outra pasta tem outro prefixo e fica intacto.
+    prefixo = _prefixo_entradas(caminho_excel)
+    for antiga in diretorio.glob("*.npz"):
+        if not antiga.name.startswith(prefixo) or _entrada_temporaria(antiga):
+            continue
+        partes = antiga.stem[len(prefixo) :].split("-")
+        if len(partes) == 2 and partes[0] != hash_arquivo:
+            antiga.unlink(missing_ok=True)
+
+    temporario = entrada.with_name(f"{entrada.stem}.{os.getpid()}.tmp.npz")
+    np.savez(
+        temporario,
+        geos=np.asarray(matriz.geos, dtype=str),
+        trimestres=np.asarray(matriz.trimestres, dtype=str),
+        valores=matriz.valores,
+        area=np.asarray([] if matriz.area is None else [matriz.area], dtype=str),
+    )
+    os.replace(temporario, entrada)
+    limitar_cache(diretorio, limite_bytes)
+    return entrada
+
+
+def limitar_cache(diretorio: Path, limite_bytes: int = LIMITE_CACHE_BYTES) -> int:
+    """Remove as entradas menos usadas ate o cache caber no limite; retorna quantas sairam."""
+    entradas = []
+    for entrada in diretorio.glob("*.npz"):
+        if _entrada_temporaria(entrada):
+            continue
+        try:
+            info = entrada.stat()
+        except FileNotFoundError:
+            continue
+        entradas.append((info.st_mtime, info.st_size, entrada))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    removidas = 0
+    for _, tamanho, entrada in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        entrada.unlink(missing_ok=True)
+        total -= tamanho
+        removidas += 1
+    return removidas
+
+
+def caminho_catalogo(caminho_excel: Path) -> Path:
+    """Arquivo do catalogo de abas, salvo ao lado do XLSX."""
+    return caminho_excel.with_name(f"{caminho_excel.stem}.catalogo.json")
+
+
+def carregar_catalogo(caminho_excel: Path) -> List[Tuple[str, str | None]] | None:
+    """
+    Retorna o catalogo [(aba, area C7)] salvo, ou None se o XLSX mudou.
+    Tamanho e mtime iguais bastam; se so o mtime mudou, o hash decide.
+    """
+    try:
+        salvo = json.loads(caminho_catalogo(caminho_excel).read_text(encoding="utf-8"))
+        info = caminho_excel.stat()
+        if salvo["versao"] != VERSAO_CACHE or salvo["tamanho"] != info.st_size:
+            return None
+        if salvo["mtime_ns"] != info.st_mtime_ns:
+            if salvo["sha256"] != impressao_digital_arquivo(caminho_excel):
+                return None
+            # Mesmo conteudo com mtime novo (ex.: arquivo copiado): atualiza a chave.
+            salvo["mtime_ns"] = info.st_mtime_ns
+            caminho_catalogo(caminho_excel).write_text(json.dumps(salvo, ensure_ascii=False), encoding="utf-8")
+        return [(nome, area) for nome, area in salvo["abas"]]
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+def salvar_catalogo(caminho_excel: Path, abas: List[Tuple[str, str | None]]) -> Path:
+    """Grava o catalogo de abas com tamanho, mtime e hash do XLSX."""
+    info = caminho_excel.stat()
+    conteudo = {
+        "versao": VERSAO_CACHE,
+        "tamanho": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "sha256": impressao_digital_arquivo(caminho_excel),
+        "abas": [[nome, area] for nome, area in abas],
+    }
+    destino = caminho_catalogo(caminho_excel)
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    temporario.write_text(json.dumps(conteudo, ensure_ascii=False), encoding="utf-8")
+    os.replace(temporario, destino)
+    return destino
+
+
+def caminho_manifesto(diretorio: Path, caminho_excel: Path) -> Path:
+    """Manifesto do modo lote para um XLSX (mesmo prefixo das entradas: homonimos em outras pastas nao colidem)."""
+    return diretorio / f"{_prefixo_entradas(caminho_excel)}manifesto.json"
+
+
+def carregar_manifesto(diretorio: Path, caminho_excel: Path) -> Dict[str, Dict[str, object]]:
+    """Retorna {aba: {"impressao": ..., "arquivos": {caminho: sha256}}} da ultima execucao (vazio se nao houver)."""
+    try:
+        salvo = json.loads(caminho_manifesto(diretorio, caminho_excel).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(salvo, dict) or salvo.get("versao") != VERSAO_CACHE:
+        return {}
+    return salvo.get("abas", {})
+
+
+def salvar_manifesto(diretorio: Path, caminho_excel: Path, abas: Dict[str, Dict[str, object]]) -> Path:
+    """Grava o manifesto do modo lote de forma atomica."""
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = caminho_manifesto(diretorio, caminho_excel)
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    temporario.write_text(
+        json.dumps({"versao": VERSAO_CACHE, "abas": abas}, ensure_ascii=False, indent=1), encoding="utf-8"
+    )
+    os.replace(temporario, destino)
+    return destino
+
+
+def assinar_saidas(arquivos: List[str]) -> Dict[str, str]:
+    """{caminho: SHA-256 do conteudo} dos arquivos gerados para uma aba (guardado no manifesto)."""
+    assinaturas = {}
+    for arquivo in arquivos:
+        digest = hashlib.sha256()
+        with open(arquivo, "rb") as conteudo:
+            for bloco in iter(lambda: conteudo.read(1024 * 1024), b""):
+                digest.update(bloco)
+        assinaturas[arquivo] = digest.hexdigest()
+    return assinaturas
+
+
+def saidas_conferem(assinaturas: object) -> bool:
+    """
+    True se cada arquivo do manifesto ainda existe com o mesmo conteudo. Outra execucao
+    (modo interativo, outro XLSX com o mesmo nome de aba) pode ter sobrescrito a saida.
+    """
+    if not isinstance(assinaturas, dict):
+        return False
+    try:
+        return assinar_saidas(list(assinaturas)) == assinaturas
+    except OSError:
+        return False
@@ -0,0 +1,191 @@
+"""
+Cubo setor x geo x trimestre com todas as abas do XLSX.
+- Cada aba (setor) vira uma fatia de uma unica matriz float32 densa; ":" vira NaN
+- Indices de rotulos para setor (nome da aba), geo e trimestre dao acesso O(1)
+- serie(setor, geo) e corte(trimestre) devolvem visoes, sem refiltrar tabelas longas
+- salvar_cubo/abrir_cubo gravam o cubo em .npy + indice JSON; abrir usa memory-map,
+  entao qualquer processo le as fatias sem copiar nem reler o XLSX
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from cache_vagas import assinar_saidas
+from leitor_xlsx import MatrizAba
+
+# pandas so e importado nas visoes rotuladas (serie/corte/setor/geo).
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Caminho padrao do cubo persistido (o indice fica em <nome>.json ao lado do .npy).
+ARQUIVO_CUBO = Path(".cache") / "cubo_vagas.npy"
+
+
+def ordenar_trimestres(rotulos: Iterable[str]) -> List[str]:
+    """Une rotulos na ordem de aparicao; se todos forem AAAA-Qn, ordena cronologicamente."""
+    unicos = list(dict.fromkeys(rotulos))
+    try:
+        return sorted(unicos, key=lambda rotulo: (int(rotulo[:4]), int(rotulo.split("-Q")[1])))
+    except (ValueError, IndexError):
+        return unicos
+
+
+class CuboVagas:
+    """Taxas de vagas em uma matriz (setor, geo, trimestre) com rotulos indexados."""
+
+    def __init__(
+        self,
+        setores: Sequence[str],
+        areas: Sequence[str | None],
+        geos: Sequence[str],
+        trimestres: Sequence[str],
+        valores: np.ndarray,
+    ) -> None:
+        if valores.shape != (len(setores), len(geos), len(trimestres)):
+            raise ValueError(
+                f"Formato {valores.shape} nao bate com {len(setores)} setores x {len(geos)} geos "
+                f"x {len(trimestres)} trimestres."
+            )
+        self.setores = list(setores)
+        self.areas = list(areas)
+        self.geos = list(geos)
+        self.trimestres = list(trimestres)
+        self.valores = valores
+        self._idx_setor = {nome: idx for idx, nome in enumerate(self.setores)}
+        self._idx_geo = {geo: idx for idx, geo in enumerate(self.geos)}
+        self._idx_trimestre = {rotulo: idx for idx, rotulo in enumerate(self.trimestres)}
+
+    @classmethod
+    def de_matrizes(cls, matrizes: Mapping[str, MatrizAba]) -> "CuboVagas":
+        """Monta o cubo a partir de {aba: MatrizAba}; abas sem nenhum valor sao ignoradas."""
+        uteis = {nome: matriz for nome, matriz in matrizes.items() if np.isfinite(matriz.valores).any()}
+        geos = list(dict.fromkeys(geo for matriz in uteis.values() for geo in matriz.geos))
+        trimestres = ordenar_trimestres(rotulo for matriz in uteis.values() for rotulo in matriz.trimestres)
+        idx_geo = {geo: idx for idx, geo in enumerate(geos)}
+        idx_trimestre = {rotulo: idx for idx, rotulo in enumerate(trimestres)}
+
+        valores = np.full((len(uteis), len(geos), len(trimestres)), np.nan, dtype=np.float32)
+        for posicao, matriz in enumerate(uteis.values()):
+            linhas = np.fromiter((idx_geo[geo] for geo in matriz.geos), dtype=np.intp, count=len(matriz.geos))
+            colunas = np.fromiter(
+                (idx_trimestre[rotulo] for rotulo in matriz.trimestres), dtype=np.intp, count=len(matriz.trimestres)
+            )
+            valores[posicao][np.ix_(linhas, colunas)] = matriz.valores
+        return cls(list(uteis), [matriz.area for matriz in uteis.values()], geos, trimestres, valores)
+
+    @property
+    def formato(self) -> Tuple[int, int, int]:
+        return self.valores.shape
+
+    def _setor(self, setor: str | int) -> int:
+        return setor if isinstance(setor, int) else self._idx_setor[setor]
+
+    def area(self, setor: str | int) -> str | None:
+        """Area (celula C7) do setor."""
+        return self.areas[self._setor(setor)]
+
+    def serie(self, setor: str | int, geo: str) -> pd.Series:
+        """Serie temporal de um geo em um setor (visao sobre o cubo)."""
+        import pandas as pd
+
+        return pd.Series(
+            self.valores[self._setor(setor), self._idx_geo[geo]],
+            index=pd.Index(self.trimestres, name="trimestre"),
+            name=geo,
+            copy=False,
+        )
+
+    def corte(self, trimestre: str) -> pd.DataFrame:
+        """Matriz setor x geo de um trimestre."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.valores[:, :, self._idx_trimestre[trimestre]],
+            index=pd.Index(self.setores, name="setor"),
+            columns=pd.Index(self.geos, name="geo"),
+            copy=False,
+        )
+
+    def setor(self, setor: str | int) -> pd.DataFrame:
+        """Matriz geo x trimestre de um setor (o equivalente a uma aba)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.valores[self._setor(setor)],
+            index=pd.Index(self.geos, name="geo"),
+            columns=pd.Index(self.trimestres, name="trimestre"),
+            copy=False,
+        )
+
+    def geo(self, geo: str) -> pd.DataFrame:
+        """Matriz setor x trimestre de um geo (comparacao entre setores)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.valores[:, self._idx_geo[geo]],
+            index=pd.Index(self.setores, name="setor"),
+            columns=pd.Index(self.trimestres, name="trimestre"),
+            copy=False,
+        )
+
+
+def caminho_indice(caminho_cubo: Path) -> Path:
+    """Indice JSON com os rotulos, ao lado do .npy."""
+    return caminho_cubo.with_suffix(".json")
+
+
+def salvar_cubo(cubo: CuboVagas, caminho_cubo: Path = ARQUIVO_CUBO, origem: Dict[str, object] | None = None) -> Path:
+    """
+    Grava os valores em .npy (float32, ordem C) e os rotulos em um JSON pequeno.
+    Os dois vao primeiro para arquivos temporarios; o .npy e renomeado antes e o indice por
+    ultimo. O indice guarda o SHA-256 do .npy, entao uma queda entre os dois renames deixa um
+    par que abrir_cubo recusa, em vez de rotulos de um cubo sobre valores de outro; copias do
+    par (cp, rsync, checkout) continuam validas porque o vinculo e o conteudo, nao o mtime.
+    """
+    caminho_cubo.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho_cubo.with_name(f"{caminho_cubo.stem}.{os.getpid()}.tmp.npy")
+    np.save(temporario, np.ascontiguousarray(cubo.valores, dtype=np.float32))
+    sha256 = assinar_saidas([str(temporario)])[str(temporario)]
+
+    indice = {
+        "formato": list(cubo.formato),
+        "setores": cubo.setores,
+        "areas": cubo.areas,
+        "geos": cubo.geos,
+        "trimestres": cubo.trimestres,
+        "origem": origem or {},
+        "valores": {"sha256": sha256},
+    }
+    destino = caminho_indice(caminho_cubo)
+    temporario_indice = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    temporario_indice.write_text(json.dumps(indice, ensure_ascii=False), encoding="utf-8")
+    os.replace(temporario, caminho_cubo)
+    os.replace(temporario_indice, destino)
+    return caminho_cubo
+
+
+def ler_indice_cubo(caminho_cubo: Path = ARQUIVO_CUBO) -> Dict[str, object]:
+    """Le so o indice JSON (rotulos, formato e origem) do cubo persistido."""
+    return json.loads(caminho_indice(caminho_cubo).read_text(encoding="utf-8"))
+
+
+def abrir_cubo(caminho_cubo: Path = ARQUIVO_CUBO) -> CuboVagas:
+    """
+    Abre o cubo persistido com memory-map somente leitura (sem copiar os valores).
+    O .npy e lido uma vez para conferir o SHA-256 guardado no indice.
+    """
+    indice = ler_indice_cubo(caminho_cubo)
+    sha256 = assinar_saidas([str(caminho_cubo)])[str(caminho_cubo)]
+    if indice.get("valores", {}).get("sha256") != sha256:
+        raise ValueError(f"Cubo {caminho_cubo} e indice fora de sincronia; gere o cubo novamente.")
+    valores = np.load(caminho_cubo, mmap_mode="r")
+    if list(valores.shape) != list(indice["formato"]):
+        raise ValueError(f"Cubo {caminho_cubo} e indice fora de sincronia; gere o cubo novamente.")
+    return CuboVagas(indice["setores"], indice["areas"], indice["geos"], indice["trimestres"], valores)
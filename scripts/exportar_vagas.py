@@ -0,0 +1,281 @@
+"""
+Exportadores adicionais da tabela arrumada (alem do CSV para o Power BI).
+- Parquet: geo com dicionario e trimestre como categoria ordenada (tipos preservados)
+- Esquema estrela: uma tabela fato com todas as abas + dimensoes de setor, geo e trimestre
+- SQLite: o mesmo esquema em um banco local indexado, para consultas ad hoc
+
+Arquivo com conteudo identico nao e reescrito (mtime preservado, sem refresh
+desnecessario no Power BI) e o que muda e gravado via arquivo temporario + rename
+atomico: CSV e Parquet por gravar_se_mudou; o SQLite e montado inteiro no temporario
+e comparado byte a byte com o banco atual antes do rename.
+"""
+
+from __future__ import annotations
+
+import filecmp
+import io
+import math
+import os
+import sqlite3
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from cubo_vagas import ordenar_trimestres
+from leitor_xlsx import MatrizAba
+
+# pandas so e importado pelos exportadores que montam tabelas.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def gravar_se_mudou(caminho: Path, conteudo: bytes) -> bool:
+    """Grava conteudo em caminho so se for diferente do atual; retorna True se gravou."""
+    try:
+        if caminho.stat().st_size == len(conteudo) and caminho.read_bytes() == conteudo:
+            return False
+    except FileNotFoundError:
+        pass
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+    temporario.write_bytes(conteudo)
+    os.replace(temporario, caminho)
+    return True
+
+
+def salvar_csv(tabela: pd.DataFrame, caminho_saida: Path) -> bool:
+    """to_csv sem indice, pulando a escrita quando o arquivo ja tem o mesmo conteudo."""
+    return gravar_se_mudou(caminho_saida, tabela.to_csv(index=False).encode("utf-8"))
+
+
+def ler_textos_png(caminho: Path) -> Dict[str, str]:
+    """Le os blocos tEXt de um PNG (onde o grafico guarda a impressao das entradas)."""
+    textos: Dict[str, str] = {}
+    try:
+        with open(caminho, "rb") as arquivo:
+            if arquivo.read(8) != b"\x89PNG\r\n\x1a\n":
+                return textos
+            while True:
+                cabecalho = arquivo.read(8)
+                if len(cabecalho) < 8:
+                    break
+                tamanho, tipo = struct.unpack(">I4s", cabecalho)
+                if tipo == b"tEXt":
+                    chave, _, valor = arquivo.read(tamanho).partition(b"\x00")
+                    textos[chave.decode("latin-1")] = valor.decode("latin-1")
+                    arquivo.seek(4, os.SEEK_CUR)
+                elif tipo == b"IEND":
+                    break
+                else:
+                    arquivo.seek(tamanho + 4, os.SEEK_CUR)
+    except OSError:
+        pass
+    return textos
+
+
+def _exigir_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit("Dependencia pyarrow ausente. Instale com: pip install pyarrow") from exc
+
+
+def salvar_parquet(dados_arrumados: pd.DataFrame, ordem_trimestres: Sequence[str], caminho_saida: Path) -> bool:
+    """
+    Grava a tabela arrumada em Parquet (retorna False se o arquivo ja estava igual).
+    geo vai como categoria (dicionario no Parquet) e trimestre como categoria ordenada,
+    entao o Power BI e o pandas leem a ordem dos trimestres sem depender de texto.
+    """
+    _exigir_pyarrow()
+    import pandas as pd
+
+    tabela = pd.DataFrame(
+        {
+            "geo": dados_arrumados["geo"].astype("category"),
+            "trimestre": pd.Categorical(
+                dados_arrumados["trimestre"].astype(str), categories=list(ordem_trimestres), ordered=True
+            ),
+            "taxa_vaga": dados_arrumados["taxa_vaga"],
+        }
+    )
+    buffer = io.BytesIO()
+    tabela.to_parquet(buffer, engine="pyarrow", index=False, compression="snappy")
+    return gravar_se_mudou(caminho_saida, buffer.getvalue())
+
+
+def montar_esquema_estrela(matrizes: Mapping[str, MatrizAba]) -> Dict[str, pd.DataFrame]:
+    """
+    Monta fato_vagas (id_setor, id_geo, id_trimestre, taxa_vaga, flag) e as dimensoes
+    dim_setor (aba + area C7), dim_geo e dim_trimestre a partir de {aba: MatrizAba}.
+    Entram no fato as celulas com valor ou com flag; abas sem nenhum valor sao ignoradas.
+    dim_geo so tem os geos que aparecem no fato (linhas sem nenhuma celula util nao viram geo).
+    """
+    import pandas as pd
+
+    uteis = {nome: matriz for nome, matriz in matrizes.items() if np.isfinite(matriz.valores).any()}
+    mascaras: List[np.ndarray] = []
+    for matriz in uteis.values():
+        flags = matriz.flags if matriz.flags is not None else np.full(matriz.valores.shape, None, dtype=object)
+        mascaras.append(np.isfinite(matriz.valores) | pd.notna(flags))
+    geos = list(
+        dict.fromkeys(
+            geo
+            for matriz, mascara in zip(uteis.values(), mascaras)
+            for geo, util in zip(matriz.geos, mascara.any(axis=1))
+            if util
+        )
+    )
+    trimestres = ordenar_trimestres(rotulo for matriz in uteis.values() for rotulo in matriz.trimestres)
+    id_geo = {geo: idx for idx, geo in enumerate(geos, start=1)}
+    id_trimestre = {rotulo: idx for idx, rotulo in enumerate(trimestres, start=1)}
+
+    partes: List[pd.DataFrame] = []
+    for id_setor, (matriz, mascara) in enumerate(zip(uteis.values(), mascaras), start=1):
+        n_geos, n_trimestres = matriz.valores.shape
+        flags = matriz.flags if matriz.flags is not None else np.full(matriz.valores.shape, None, dtype=object)
+        # Geo sem celula util nesta aba (e talvez fora de dim_geo) nao gera linha no fato.
+        ids_geo = np.fromiter((id_geo.get(geo, 0) for geo in matriz.geos), dtype=np.int32, count=n_geos)
+        ids_trimestre = np.fromiter(
+            (id_trimestre[rotulo] for rotulo in matriz.trimestres), dtype=np.int16, count=n_trimestres
+        )
+        linhas, colunas = np.nonzero(mascara)
+        partes.append(
+            pd.DataFrame(
+                {
+                    "id_setor": np.full(len(linhas), id_setor, dtype=np.int16),
+                    "id_geo": ids_geo[linhas],
+                    "id_trimestre": ids_trimestre[colunas],
+                    "taxa_vaga": matriz.valores[linhas, colunas],
+                    "flag": flags[linhas, colunas],
+                }
+            )
+        )
+
+    colunas_fato = ["id_setor", "id_geo", "id_trimestre", "taxa_vaga", "flag"]
+    fato = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=colunas_fato)
+    fato = fato.sort_values(["id_setor", "id_geo", "id_trimestre"], ignore_index=True)
+
+    dim_trimestre = pd.DataFrame({"id_trimestre": list(id_trimestre.values()), "trimestre": trimestres})
+    partes_rotulo = dim_trimestre["trimestre"].str.extract(r"^(\d{4})-Q([1-4])$")
+    dim_trimestre["ano"] = pd.to_numeric(partes_rotulo[0], errors="coerce").astype("Int16")
+    dim_trimestre["numero_trimestre"] = pd.to_numeric(partes_rotulo[1], errors="coerce").astype("Int8")
+
+    return {
+        "fato_vagas": fato,
+        "dim_setor": pd.DataFrame(
+            {
+                "id_setor": range(1, len(uteis) + 1),
+                "aba": list(uteis),
+                "area": [matriz.area for matriz in uteis.values()],
+            }
+        ),
+        "dim_geo": pd.DataFrame({"id_geo": list(id_geo.values()), "geo": geos}),
+        "dim_trimestre": dim_trimestre,
+    }
+
+
+def salvar_esquema_estrela(
+    tabelas: Mapping[str, pd.DataFrame],
+    diretorio: Path,
+    parquet: bool = False,
+) -> List[Path]:
+    """Grava cada tabela do esquema estrela em CSV (ou Parquet) dentro de diretorio."""
+    if parquet:
+        _exigir_pyarrow()
+    gerados: List[Path] = []
+    for nome, tabela in tabelas.items():
+        if parquet:
+            caminho = diretorio / f"{nome}.parquet"
+            buffer = io.BytesIO()
+            tabela.to_parquet(buffer, engine="pyarrow", index=False, compression="snappy")
+            gravar_se_mudou(caminho, buffer.getvalue())
+        else:
+            caminho = diretorio / f"{nome}.csv"
+            salvar_csv(tabela, caminho)
+        gerados.append(caminho)
+    return gerados
+
+
+_DDL_SQLITE = """
+CREATE TABLE dim_setor (id_setor INTEGER PRIMARY KEY, aba TEXT NOT NULL UNIQUE, area TEXT);
+CREATE TABLE dim_geo (id_geo INTEGER PRIMARY KEY, geo TEXT NOT NULL UNIQUE);
+CREATE TABLE dim_trimestre (
+    id_trimestre INTEGER PRIMARY KEY,
+    trimestre TEXT NOT NULL UNIQUE,
+    ano INTEGER,
+    numero_trimestre INTEGER
+);
+CREATE TABLE fato_vagas (
+    id_setor INTEGER NOT NULL REFERENCES dim_setor (id_setor),
+    id_geo INTEGER NOT NULL REFERENCES dim_geo (id_geo),
+    id_trimestre INTEGER NOT NULL REFERENCES dim_trimestre (id_trimestre),
+    taxa_vaga REAL,
+    flag TEXT,
+    PRIMARY KEY (id_setor, id_geo, id_trimestre)
+) WITHOUT ROWID;
+CREATE VIEW vagas AS
+SELECT s.aba, s.area, g.geo, t.trimestre, f.taxa_vaga, f.flag
+FROM fato_vagas f
+JOIN dim_setor s USING (id_setor)
+JOIN dim_geo g USING (id_geo)
+JOIN dim_trimestre t USING (id_trimestre);
+"""
+
+# Indices criados depois da carga (mais rapido que manter durante os inserts).
+_INDICES_SQLITE = """
+CREATE INDEX idx_fato_geo_trimestre ON fato_vagas (id_geo, id_trimestre);
+CREATE INDEX idx_fato_trimestre ON fato_vagas (id_trimestre);
+"""
+
+
+def _linhas_sql(tabela: pd.DataFrame):
+    """Linhas da tabela com tipos do Python e NaN/NA como NULL."""
+    import pandas as pd
+
+    for linha in tabela.itertuples(index=False, name=None):
+        yield tuple(
+            None if valor is None or valor is pd.NA or (isinstance(valor, float) and math.isnan(valor)) else valor
+            for valor in linha
+        )
+
+
+def salvar_sqlite(tabelas: Mapping[str, pd.DataFrame], caminho_db: Path) -> Path:
+    """
+    Carrega o esquema estrela em um banco SQLite com indices em (setor, geo, trimestre).
+    Tudo entra em uma unica transacao com executemany; o banco e montado em um arquivo
+    temporario e trocado por rename, entao quem consulta nunca ve um banco pela metade.
+    A montagem e deterministica: se o banco novo for identico ao atual, o atual fica
+    (mtime preservado). Se a montagem falhar, o temporario e apagado.
+    A view vagas junta fato e dimensoes com os rotulos legiveis.
+    """
+    caminho_db.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho_db.with_name(f".{caminho_db.name}.{os.getpid()}.tmp")
+    temporario.unlink(missing_ok=True)
+    try:
+        conexao = sqlite3.connect(temporario)
+        try:
+            conexao.execute("PRAGMA journal_mode = OFF")
+            conexao.execute("PRAGMA synchronous = OFF")
+            conexao.executescript(_DDL_SQLITE)
+            with conexao:
+                for nome in ("dim_setor", "dim_geo", "dim_trimestre", "fato_vagas"):
+                    tabela = tabelas[nome]
+                    marcadores = ", ".join("?" for _ in tabela.columns)
+                    conexao.executemany(
+                        f"INSERT INTO {nome} ({', '.join(tabela.columns)}) VALUES ({marcadores})", _linhas_sql(tabela)
+                    )
+            conexao.executescript(_INDICES_SQLITE)
+            conexao.execute("ANALYZE")
+            conexao.commit()
+        finally:
+            conexao.close()
+        if caminho_db.exists() and filecmp.cmp(temporario, caminho_db, shallow=False):
+            temporario.unlink()
+        else:
+            os.replace(temporario, caminho_db)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+    return caminho_db
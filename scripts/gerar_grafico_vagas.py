@@ -4,16 +4,91 @@ Script simples e interativo:
 - Lista as abas do arquivo data/job_vacancies.xlsx
 - Voce escolhe a aba (apenas isso)
 - Gera CSV arrumado e grafico PNG com padroes fixos
+
+Modo lote (--todas ou --aba) roda sem menu e processa varias abas abrindo o workbook uma unica vez;
+--aba aceita nome, numero do menu, glob ou "todas", e --particao I/N divide as abas entre maquinas.
+--arquivo, --linha-cabecalho/--linha-dados, --geos e --saida-tabelas/--saida-graficos trocam os padroes.
+--observar fica vigiando o diretorio do XLSX e refaz so as abas alteradas quando chega um arquivo novo.
+O motor padrao (--motor xml) le o XML das abas em streaming; --motor pandas usa pd.read_excel.
+Abas ja lidas ficam em cache no diretorio .cache/ (desligue com --sem-cache).
+Com --jobs N, o modo lote distribui a leitura das abas e o desenho dos graficos entre N processos.
+pandas e matplotlib so sao importados quando a aba e carregada/plotada: o menu aparece antes.
+O modo lote so refaz as abas cujo XML mudou desde a ultima execucao (--forcar refaz todas).
+--compacto usa tipos enxutos na tabela em memoria (geo categoria, trimestre int16, taxa float32).
+--parquet tambem grava PowerBI/tabela_vagas_<aba>.parquet (requer pyarrow).
+--estrela grava um esquema estrela (fato + dimensoes) com todas as abas em PowerBI/estrela/.
+--sqlite grava todas as abas em PowerBI/vagas.sqlite (indices por setor, geo e trimestre; view vagas).
+--perfil escolhe o grafico: previa (PNG leve), publicacao (PNG 300 dpi, padrao), svg ou pdf.
+--salvar-cubo grava o cubo setor x geo x trimestre em .cache/cubo_vagas.npy (+ indice JSON) para memory-map.
+--servir sobe um servidor HTTP local com as tabelas (JSON/CSV) e os graficos mantidos em memoria.
+--medir mede parede, CPU e pico de memoria de cada etapa (--medir-json grava JSON, --cprofile um .prof por etapa).
 """
 
 from __future__ import annotations
 
+import argparse
+import contextlib
+import fnmatch
+import hashlib
 import re
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+from cache_vagas import (
+    DIRETORIO_CACHE,
+    VERSAO_CACHE,
+    assinar_saidas,
+    carregar_catalogo,
+    impressao_digital_arquivo,
+    carregar_manifesto,
+    carregar_matriz_cache,
+    saidas_conferem,
+    salvar_catalogo,
+    salvar_manifesto,
+    salvar_matriz_cache,
+)
+from cubo_vagas import ARQUIVO_CUBO, CuboVagas, salvar_cubo
+from exportar_vagas import (
+    montar_esquema_estrela,
+    salvar_csv,
+    salvar_esquema_estrela,
+    salvar_parquet,
+    salvar_sqlite,
+)
+from graficos_vagas import (
+    PERFIL_PADRAO,
+    PERFIS_RENDER,
+    PoolGraficos,
+    RenderizadorGrafico,
+    Serie,
+    caminho_grafico,
+    desenhar_grafico,
+    iniciar_processo_grafico,
+    ler_impressao_grafico,
+    perfil_render,
+)
+from leitor_xlsx import (
+    MARCADOR_RODAPE,
+    MatrizAba,
+    abrir_livro,
+    impressao_matriz,
+    ler_aba_xml,
+    listar_abas_areas,
+    listar_nomes_abas,
+)
+from medicao_vagas import etapa, medir_etapas
+from observador_vagas import INTERVALO_PADRAO, assinaturas_arquivos, observar_arquivos
 
-import matplotlib.pyplot as plt
-import pandas as pd
+# pandas e matplotlib so sao importados nas etapas que os usam (carga, exportacao e grafico),
+# para o menu de abas aparecer sem pagar o import dessas bibliotecas.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # Caminho padrao do arquivo baixado da Eurostat.
@@ -26,6 +101,19 @@ PAISES_PADRAO = [
     "France",
     "Spain",
 ]
+# Diretorios de saida padrao: tabelas para o Power BI e graficos.
+DIRETORIO_TABELAS = Path("PowerBI")
+DIRETORIO_GRAFICOS = Path("plots")
+# Diretorio do esquema estrela consolidado para o Power BI.
+DIRETORIO_ESTRELA = DIRETORIO_TABELAS / "estrela"
+# Banco SQLite local para consultas ad hoc.
+ARQUIVO_SQLITE = DIRETORIO_TABELAS / "vagas.sqlite"
+# Seletores de --aba que escolhem todas as abas.
+SELETORES_TODAS = ("todas", "all")
+# Motores de leitura disponiveis para carregar_tabela_vagas.
+MOTORES = ("xml", "pandas")
+# Rotulo de trimestre da Eurostat (ex.: 2023-Q2).
+_ROTULO_TRIMESTRE = re.compile(r"^(\d{4})-Q([1-4])$")
 
 
 def slugificar(nome_aba: str) -> str:
@@ -36,6 +124,8 @@ def slugificar(nome_aba: str) -> str:
 
 def montar_nomes_colunas(linha_cabecalho: Sequence[object]) -> List[str]:
     """Propaga os rotulos de trimestre; cabecalhos vazios viram flags."""
+    import pandas as pd
+
     colunas: List[str] = []
     for idx, valor in enumerate(linha_cabecalho):
         if idx == 0:
@@ -48,18 +138,259 @@ def montar_nomes_colunas(linha_cabecalho: Sequence[object]) -> List[str]:
     return colunas
 
 
-def carregar_tabela_vagas(
+def trimestre_para_ordinal(rotulo: str) -> int | None:
+    """Converte '2023-Q2' no ordinal de periodo trimestral do pandas (None se nao for trimestre)."""
+    casamento = _ROTULO_TRIMESTRE.match(rotulo)
+    if casamento is None:
+        return None
+    return (int(casamento.group(1)) - 1970) * 4 + int(casamento.group(2)) - 1
+
+
+def ordinal_para_trimestre(ordinal: int) -> str:
+    """Inverso de trimestre_para_ordinal."""
+    ano, trimestre = divmod(int(ordinal), 4)
+    return f"{ano + 1970}-Q{trimestre + 1}"
+
+
+def rotulos_trimestre(coluna: pd.Series) -> pd.Series:
+    """Texto dos trimestres, seja a coluna categorica (padrao) ou ordinal int16 (compacta)."""
+    import pandas as pd
+
+    if pd.api.types.is_integer_dtype(coluna):
+        return coluna.map(ordinal_para_trimestre)
+    return coluna.astype(str)
+
+
+def tabela_longa_da_matriz(matriz: MatrizAba, compacto: bool = False) -> pd.DataFrame:
+    """
+    Monta o formato longo (mesma ordem do melt) direto da matriz geo x trimestre.
+    Com compacto, geo vira categoria, trimestre vira ordinal int16 e taxa_vaga vira float32.
+    """
+    import pandas as pd
+
+    n_geos, n_trimestres = matriz.valores.shape
+    valores = matriz.valores.T.ravel()
+    mascara = ~np.isnan(valores)
+    posicoes = np.flatnonzero(mascara)
+    codigos_trimestre = np.repeat(np.arange(n_trimestres), n_geos)[mascara]
+
+    if not compacto:
+        return pd.DataFrame(
+            {
+                "geo": np.tile(np.asarray(matriz.geos, dtype=object), n_trimestres)[mascara],
+                "trimestre": pd.Categorical.from_codes(
+                    codigos_trimestre, categories=matriz.trimestres, ordered=True
+                ),
+                "taxa_vaga": valores[mascara],
+            },
+            index=posicoes,
+        )
+
+    # Categorias em ordem alfabetica: series_grafico ordena pelo codigo, e a ordem (legenda e cores)
+    # tem que ser a mesma do modo nao compacto, que ordena pelo texto.
+    codigos_geo, geos_unicos = pd.factorize(pd.Index(matriz.geos, dtype=object), sort=True)
+    ordinais = [trimestre_para_ordinal(str(rotulo)) for rotulo in matriz.trimestres]
+    if all(ordinal is not None for ordinal in ordinais):
+        trimestre = np.asarray(ordinais, dtype=np.int16)[codigos_trimestre]
+    else:
+        # Rotulos fora do padrao AAAA-Qn continuam como categoria ordenada.
+        trimestre = pd.Categorical.from_codes(codigos_trimestre, categories=matriz.trimestres, ordered=True)
+    return pd.DataFrame(
+        {
+            "geo": pd.Categorical.from_codes(
+                np.tile(codigos_geo, n_trimestres)[mascara], categories=geos_unicos
+            ).remove_unused_categories(),
+            "trimestre": trimestre,
+            "taxa_vaga": valores[mascara].astype(np.float32),
+        },
+        index=posicoes,
+    )
+
+
+def resolver_abas(seletores: Sequence[str], nomes_abas: Sequence[str]) -> List[str]:
+    """
+    Converte seletores de aba em nomes, na ordem do workbook e sem repetir.
+    Cada seletor pode ser o nome exato, o numero do menu (1 = primeira aba), um
+    intervalo de numeros (ex.: "20-25", inclusivo), um padrao glob (ex.: "Sheet 1*")
+    ou "todas"/"all".
+    """
+    escolhidas = set()
+    for seletor in seletores:
+        if seletor.lower() in SELETORES_TODAS:
+            escolhidas.update(nomes_abas)
+        elif seletor in nomes_abas:
+            escolhidas.add(seletor)
+        elif seletor.isdigit():
+            numero = int(seletor)
+            if not 1 <= numero <= len(nomes_abas):
+                raise SystemExit(f"Numero de aba fora da lista: {seletor} (use de 1 a {len(nomes_abas)}).")
+            escolhidas.add(nomes_abas[numero - 1])
+        elif re.fullmatch(r"\d+-\d+", seletor):
+            primeira, ultima = (int(numero) for numero in seletor.split("-"))
+            if not 1 <= primeira <= ultima <= len(nomes_abas):
+                raise SystemExit(
+                    f"Intervalo de abas invalido: {seletor} (use I-J com 1 <= I <= J <= {len(nomes_abas)})."
+                )
+            escolhidas.update(nomes_abas[primeira - 1 : ultima])
+        elif any(caractere in seletor for caractere in "*?["):
+            casadas = fnmatch.filter(nomes_abas, seletor)
+            if not casadas:
+                raise SystemExit(f"Nenhuma aba casa com o padrao: {seletor}")
+            escolhidas.update(casadas)
+        else:
+            raise SystemExit(f"Aba nao encontrada no XLSX: {seletor}")
+    return [nome for nome in nomes_abas if nome in escolhidas]
+
+
+def ler_particao(texto: str) -> Tuple[int, int]:
+    """Le 'I/N' (parte I de N, comecando em 1) para dividir as abas entre maquinas."""
+    try:
+        parte, total = (int(numero) for numero in texto.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Particao invalida: {texto} (use I/N, ex.: 2/4)") from None
+    if not 1 <= parte <= total:
+        raise argparse.ArgumentTypeError(f"Particao invalida: {texto} (I deve estar entre 1 e N)")
+    return parte, total
+
+
+def particionar_abas(nomes_abas: Sequence[str], particao: Tuple[int, int]) -> List[str]:
+    """Parte I de N das abas, alternando (aba 1 na parte 1, aba 2 na parte 2, ...) para equilibrar a carga."""
+    parte, total = particao
+    return list(nomes_abas[parte - 1 :: total])
+
+
+def carregar_matriz_vagas(
+    caminho_excel: Path,
+    nome_aba: str,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    diretorio_cache: Path | None = None,
+) -> MatrizAba:
+    """Le a aba com o parser XML, passando antes pelo cache quando houver diretorio_cache."""
+    if diretorio_cache is not None:
+        matriz = carregar_matriz_cache(diretorio_cache, caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados)
+        if matriz is not None:
+            return matriz
+    matriz = ler_aba_xml(caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados)
+    if diretorio_cache is not None:
+        salvar_matriz_cache(diretorio_cache, caminho_excel, nome_aba, matriz, linha_cabecalho, linha_inicio_dados)
+    return matriz
+
+
+def _ler_matriz_cronometrada(
     caminho_excel: Path,
     nome_aba: str,
+    diretorio_cache: Path | None,
     linha_cabecalho: int = 10,
     linha_inicio_dados: int = 12,
+) -> Tuple[MatrizAba, float]:
+    """Tarefa dos processos do modo lote: devolve so a matriz compacta e o tempo gasto."""
+    inicio = time.perf_counter()
+    matriz = carregar_matriz_vagas(caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados, diretorio_cache)
+    return matriz, time.perf_counter() - inicio
+
+
+def montar_cubo(
+    caminho_excel: Path,
+    abas: Sequence[str] | None = None,
+    diretorio_cache: Path | None = None,
+    jobs: int = 1,
+) -> CuboVagas:
+    """Le as abas (todas, se abas for None) e monta o cubo setor x geo x trimestre."""
+    nomes = listar_nomes_abas(caminho_excel) if abas is None else list(abas)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            lidas = executor.map(
+                _ler_matriz_cronometrada, [caminho_excel] * len(nomes), nomes, [diretorio_cache] * len(nomes)
+            )
+            matrizes = {nome: matriz for nome, (matriz, _) in zip(nomes, lidas)}
+    else:
+        matrizes = {nome: carregar_matriz_vagas(caminho_excel, nome, diretorio_cache=diretorio_cache) for nome in nomes}
+    return CuboVagas.de_matrizes(matrizes)
+
+
+def gerar_cubo_persistido(
+    caminho_excel: Path,
+    caminho_cubo: Path = ARQUIVO_CUBO,
+    diretorio_cache: Path | None = None,
+    jobs: int = 1,
+) -> Path:
+    """Monta o cubo com todas as abas e grava .npy + indice JSON (com o hash do XLSX de origem)."""
+    if not caminho_excel.exists():
+        raise SystemExit(f"Arquivo nao encontrado: {caminho_excel}")
+    cubo = montar_cubo(caminho_excel, diretorio_cache=diretorio_cache, jobs=jobs)
+    origem = {"arquivo": str(caminho_excel), "sha256": impressao_digital_arquivo(caminho_excel)}
+    salvar_cubo(cubo, caminho_cubo, origem)
+    setores, geos, trimestres = cubo.formato
+    print(f"Cubo salvo em {caminho_cubo} ({setores} setores x {geos} geos x {trimestres} trimestres)")
+    return caminho_cubo
+
+
+def montar_tabelas_estrela(caminho_excel: Path) -> Dict[str, pd.DataFrame]:
+    """Le todas as abas (com flags) e monta fato_vagas + dim_setor/dim_geo/dim_trimestre."""
+    if not caminho_excel.exists():
+        raise SystemExit(f"Arquivo nao encontrado: {caminho_excel}")
+    livro = abrir_livro(caminho_excel)
+    matrizes = {nome: livro.ler_aba(nome, com_flags=True) for nome in livro.partes}
+    return montar_esquema_estrela(matrizes)
+
+
+def gerar_esquema_estrela(
+    caminho_excel: Path,
+    diretorio: Path = DIRETORIO_ESTRELA,
+    parquet: bool = False,
+) -> List[Path]:
+    """Grava o esquema estrela de todas as abas em diretorio (CSV ou Parquet)."""
+    tabelas = montar_tabelas_estrela(caminho_excel)
+    gerados = salvar_esquema_estrela(tabelas, diretorio, parquet=parquet)
+    print(
+        f"Esquema estrela salvo em {diretorio} ({len(tabelas['fato_vagas'])} fatos, "
+        f"{len(tabelas['dim_setor'])} setores, {len(tabelas['dim_geo'])} geos, "
+        f"{len(tabelas['dim_trimestre'])} trimestres)"
+    )
+    return gerados
+
+
+def gerar_banco_sqlite(caminho_excel: Path, caminho_db: Path = ARQUIVO_SQLITE) -> Path:
+    """Grava todas as abas em um banco SQLite indexado para consultas ad hoc."""
+    tabelas = montar_tabelas_estrela(caminho_excel)
+    salvar_sqlite(tabelas, caminho_db)
+    print(f"Banco SQLite salvo em {caminho_db} ({len(tabelas['fato_vagas'])} fatos; consulte a view vagas)")
+    return caminho_db
+
+
+def carregar_tabela_vagas(
+    caminho_excel: Path | pd.ExcelFile,
+    nome_aba: str,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    motor: str = "xml",
+    diretorio_cache: Path | None = None,
+    compacto: bool = False,
 ) -> Tuple[pd.DataFrame, List[str], str | None]:
     """
     Converte a aba da Eurostat em um DataFrame arrumado (geo, trimestre, taxa de vagas).
     Linhas sao indexadas em zero: cabecalho na linha 10 e dados a partir da linha 12.
+    Aceita um pd.ExcelFile ja aberto para reaproveitar o workbook entre varias abas
+    (nesse caso o motor pandas e usado). Com diretorio_cache, o motor xml reaproveita
+    a aba ja lida enquanto o XLSX nao mudar. Com compacto, a tabela usa os tipos
+    enxutos de tabela_longa_da_matriz; o CSV exportado continua com os rotulos de trimestre.
     """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {motor} (use um de {', '.join(MOTORES)})")
+    if motor == "xml" and isinstance(caminho_excel, (str, Path)):
+        with etapa("carga", nome_aba):
+            matriz = carregar_matriz_vagas(
+                caminho_excel, nome_aba, linha_cabecalho, linha_inicio_dados, diretorio_cache
+            )
+        with etapa("arrumacao", nome_aba):
+            return tabela_longa_da_matriz(matriz, compacto), list(matriz.trimestres), matriz.area
+
+    import pandas as pd
+
     # Carrega a aba bruta sem inferir cabecalho.
-    bruto = pd.read_excel(caminho_excel, sheet_name=nome_aba, header=None)
+    with etapa("carga", nome_aba):
+        bruto = pd.read_excel(caminho_excel, sheet_name=nome_aba, header=None)
 
     # Captura a area/industria descrita na celula C7.
     area_trabalho: str | None = None
@@ -73,72 +404,110 @@ def carregar_tabela_vagas(
     cabecalho = bruto.iloc[linha_cabecalho]
     colunas = montar_nomes_colunas(cabecalho)
 
-    # Mantem apenas linhas com geo e pivotamento para formato longo.
-    dados = bruto.iloc[linha_inicio_dados:].reset_index(drop=True)
-    dados.columns = colunas
-    dados = dados[dados["geo"].notna()]
+    # Mantem apenas linhas com geo, ate a primeira linha vazia (ou a legenda) depois dos dados.
+    dados = bruto.iloc[linha_inicio_dados:]
+    sem_geo = (dados.iloc[:, 0].isna() | (dados.iloc[:, 0] == MARCADOR_RODAPE)).to_numpy()
+    if not sem_geo.all():
+        primeira = int(np.argmin(sem_geo))
+        depois = sem_geo[primeira:]
+        dados = dados.iloc[: primeira + int(np.argmax(depois)) if depois.any() else len(dados)]
+    dados = dados[dados.iloc[:, 0].notna()]
 
-    colunas_valor = [col for col in colunas if col != "geo" and not col.endswith("_flag")]
-    arrumado = (
-        dados[["geo"] + colunas_valor]
-        .replace({":": pd.NA})
-        .melt(id_vars="geo", var_name="trimestre", value_name="taxa_vaga")
-    )
-    arrumado["taxa_vaga"] = pd.to_numeric(arrumado["taxa_vaga"], errors="coerce")
-    arrumado = arrumado.dropna(subset=["taxa_vaga"])
-    arrumado["trimestre"] = pd.Categorical(arrumado["trimestre"], categories=colunas_valor, ordered=True)
+    with etapa("arrumacao", nome_aba):
+        # Converte o bloco de valores (sem flags) em float de uma vez; ":" e textos viram NaN.
+        posicoes_valor = [idx for idx, col in enumerate(colunas) if idx > 0 and not col.endswith("_flag")]
+        colunas_valor = [colunas[idx] for idx in posicoes_valor]
+        bloco = dados.iloc[:, posicoes_valor].to_numpy(dtype=object)
+        numeros = pd.to_numeric(pd.Series(bloco.ravel()), errors="coerce")
+        valores = numeros.to_numpy(dtype=float).reshape(bloco.shape)
+
+        # Formato longo por reshape (geo repetido por trimestre) em vez de replace + melt.
+        matriz = MatrizAba(list(dados.iloc[:, 0]), colunas_valor, valores, area_trabalho)
+        arrumado = tabela_longa_da_matriz(matriz, compacto)
     return arrumado, colunas_valor, area_trabalho
 
 
+def series_grafico(dados_arrumados: pd.DataFrame, paises: Iterable[str]) -> List[Serie]:
+    """Separa as series (geo, trimestres, taxas) que vao para o grafico, ordenadas por geo e trimestre."""
+    paises = list(paises)
+    recorte = dados_arrumados[dados_arrumados["geo"].isin(paises)]
+    if recorte.empty:
+        raise ValueError("Nenhuma linha encontrada para os paises informados.")
+    recorte = recorte.sort_values(["geo", "trimestre"])
+    return [
+        (str(geo), rotulos_trimestre(grupo["trimestre"]).tolist(), _taxas_serie(grupo["taxa_vaga"]))
+        for geo, grupo in recorte.groupby("geo", observed=True)
+    ]
+
+
+def _taxas_serie(coluna: pd.Series) -> List[float]:
+    """Taxas como float; float32 (modo compacto) passa pelo texto mais curto, como no CSV (4.1, nao 4.0999999)."""
+    if coluna.dtype == np.float32:
+        return np.asarray(coluna.to_numpy().astype(str), dtype=float).tolist()
+    return coluna.astype(float).tolist()
+
+
+def impressao_grafico(series: Sequence[Serie], titulo: str, perfil: str = PERFIL_PADRAO) -> str:
+    """Hash das entradas do grafico (series, titulo, formato/dpi do perfil e versao do matplotlib)."""
+    import importlib.metadata
+
+    dados_perfil = perfil_render(perfil)
+    digest = hashlib.sha256(
+        f"{titulo}|{dados_perfil.formato}|{dados_perfil.dpi}|{importlib.metadata.version('matplotlib')}".encode("utf-8")
+    )
+    for geo, trimestres, taxas in series:
+        digest.update(f"|{geo}|{trimestres}|{taxas}".encode("utf-8"))
+    return digest.hexdigest()
+
+
 def plotar_taxa_vagas(
     dados_arrumados: pd.DataFrame,
     ordem_trimestres: Sequence[str],
     paises: Iterable[str],
     nome_aba: str,
     caminho_saida: Path,
-) -> None:
-    """Desenha o grafico de linhas para os paises escolhidos."""
-    paises = list(paises)
-    recorte = dados_arrumados[dados_arrumados["geo"].isin(paises)].copy()
-    if recorte.empty:
-        raise ValueError("Nenhuma linha encontrada para os paises informados.")
-
-    recorte = recorte.sort_values(["geo", "trimestre"])
-    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    for geo, grupo in recorte.groupby("geo"):
-        ax.plot(grupo["trimestre"].astype(str), grupo["taxa_vaga"], marker="o", label=geo)
+    renderizador: RenderizadorGrafico | PoolGraficos | None = None,
+    perfil: str = PERFIL_PADRAO,
+) -> bool:
+    """
+    Desenha o grafico de linhas para os paises escolhidos no perfil de render (PNG/SVG/PDF).
+    Se o arquivo existente foi gerado com as mesmas entradas, nada e redesenhado; retorna True se gravou.
+    Com renderizador (modo lote), a mesma figura e reaproveitada entre graficos e o perfil e o
+    do renderizador; com um PoolGraficos o desenho so e agendado em outro processo (True = enviado).
+    """
+    if renderizador is not None:
+        perfil = renderizador.perfil
+    series = series_grafico(dados_arrumados, paises)
+    titulo = f"Taxa de vagas de trabalho - {nome_aba}"
+    impressao = impressao_grafico(series, titulo, perfil)
+    if ler_impressao_grafico(caminho_saida) == impressao:
+        return False
+    if renderizador is not None:
+        renderizador.desenhar(series, titulo, caminho_saida, impressao)
+    else:
+        desenhar_grafico(series, titulo, caminho_saida, impressao, perfil)
+    return True
 
-    ax.set_title(f"Taxa de vagas de trabalho - {nome_aba}")
-    ax.set_ylabel("Taxa de vagas (%)")
-    ax.set_xlabel("Trimestre")
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-    fig.tight_layout()
-    fig.savefig(caminho_saida, dpi=300)
-    plt.close(fig)
 
+def listar_abas_excel(caminho_excel: Path, usar_catalogo: bool = True) -> List[Tuple[str, str | None]]:
+    """
+    Retorna lista de (aba, area) lendo a celula C7 de cada aba.
+    Com usar_catalogo, reaproveita o catalogo salvo ao lado do XLSX enquanto o arquivo nao mudar.
+    """
+    with etapa("catalogo"):
+        if usar_catalogo:
+            abas_salvas = carregar_catalogo(caminho_excel)
+            if abas_salvas is not None:
+                return abas_salvas
 
-def listar_abas_excel(caminho_excel: Path) -> List[Tuple[str, str | None]]:
-    """Retorna lista de (aba, area) lendo a celula C7 de cada aba."""
-    try:
-        import openpyxl
-    except ImportError as exc:
-        raise SystemExit("Dependencia openpyxl ausente. Instale com: pip install openpyxl") from exc
-
-    # Carrega workbook em modo somente leitura para inspecionar cabecalho.
-    wb = openpyxl.load_workbook(caminho_excel, read_only=True, data_only=True)
-    abas: List[Tuple[str, str | None]] = []
-    for nome in wb.sheetnames:
-        try:
-            valor = wb[nome]["C7"].value
-            area = str(valor) if valor is not None else None
-        except Exception:
-            area = None
-        abas.append((nome, area))
-    wb.close()
-    return abas
+        # Le apenas ate a linha 7 de cada aba (sem openpyxl).
+        abas = listar_abas_areas(caminho_excel)
+        if usar_catalogo:
+            try:
+                salvar_catalogo(caminho_excel, abas)
+            except OSError:
+                pass
+        return abas
 
 
 def mostrar_resumo(
@@ -165,8 +534,89 @@ def mostrar_resumo(
     print()
 
 
-def fluxo_interativo(caminho_excel: Path) -> None:
-    """Fluxo unico: escolher aba e gerar CSV + PNG com padroes fixos."""
+def exportar_artefatos(
+    dados_arrumados: pd.DataFrame,
+    ordem_trimestres: Sequence[str],
+    nome_aba: str,
+    paises: Iterable[str] = PAISES_PADRAO,
+    verbose: bool = True,
+    parquet: bool = False,
+    renderizador: RenderizadorGrafico | PoolGraficos | None = None,
+    perfil: str = PERFIL_PADRAO,
+    diretorio_tabelas: Path = DIRETORIO_TABELAS,
+    diretorio_graficos: Path = DIRETORIO_GRAFICOS,
+) -> List[Path]:
+    """
+    Valida os geos, salva o CSV (e opcionalmente o Parquet) em diretorio_tabelas e o grafico
+    em diretorio_graficos no perfil de render (com renderizador, vale o perfil dele).
+    """
+    import pandas as pd
+
+    if renderizador is not None:
+        perfil = renderizador.perfil
+    slug_aba = slugificar(nome_aba)
+    caminho_csv = diretorio_tabelas / f"tabela_vagas_{slug_aba}.csv"
+    arquivo_grafico = caminho_grafico(diretorio_graficos, f"grafico_vagas_{slug_aba}", perfil)
+
+    with etapa("validacao", nome_aba):
+        geos_disponiveis = set(dados_arrumados["geo"].unique())
+        paises = list(paises)
+        faltantes = [geo for geo in paises if geo not in geos_disponiveis]
+        if faltantes and verbose:
+            print(f"Aviso: estes geos nao foram encontrados e serao ignorados: {', '.join(faltantes)}")
+        paises_validos = [geo for geo in paises if geo in geos_disponiveis]
+        if not paises_validos:
+            raise SystemExit("Nenhum geo valido restou para plotar. Ajuste os nomes e tente de novo.")
+
+    with etapa("exportacao", nome_aba):
+        # Exporta artefatos finais com nomes padrao.
+        tabela_saida = dados_arrumados
+        if pd.api.types.is_integer_dtype(dados_arrumados["trimestre"]):
+            tabela_saida = dados_arrumados.assign(trimestre=rotulos_trimestre(dados_arrumados["trimestre"]))
+        # Arquivos com o mesmo conteudo nao sao reescritos (evita refresh a toa no Power BI).
+        gravou = salvar_csv(tabela_saida, caminho_csv)
+        if verbose:
+            print(f"Tabela arrumada {'salva em' if gravou else 'sem alteracoes:'} {caminho_csv}")
+        gerados = [caminho_csv]
+
+        if parquet:
+            caminho_parquet = caminho_csv.with_suffix(".parquet")
+            gravou = salvar_parquet(tabela_saida, ordem_trimestres, caminho_parquet)
+            if verbose:
+                print(f"Parquet salvo em {caminho_parquet}" if gravou else f"Parquet sem alteracoes: {caminho_parquet}")
+            gerados.append(caminho_parquet)
+
+    inicio = time.perf_counter()
+    with etapa("grafico", nome_aba):
+        gravou = plotar_taxa_vagas(
+            dados_arrumados, ordem_trimestres, paises_validos, nome_aba, arquivo_grafico, renderizador, perfil
+        )
+    if verbose:
+        if gravou:
+            print(
+                f"Grafico salvo em {arquivo_grafico} (perfil {perfil}: {time.perf_counter() - inicio:.2f}s, "
+                f"{arquivo_grafico.stat().st_size / 1024:.0f} KB)"
+            )
+        else:
+            print(f"Grafico sem alteracoes: {arquivo_grafico}")
+    gerados.append(arquivo_grafico)
+    return gerados
+
+
+def fluxo_interativo(
+    caminho_excel: Path,
+    motor: str = "xml",
+    diretorio_cache: Path | None = DIRETORIO_CACHE,
+    compacto: bool = False,
+    parquet: bool = False,
+    perfil: str = PERFIL_PADRAO,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    paises: Sequence[str] = PAISES_PADRAO,
+    diretorio_tabelas: Path = DIRETORIO_TABELAS,
+    diretorio_graficos: Path = DIRETORIO_GRAFICOS,
+) -> None:
+    """Fluxo unico: escolher aba no menu e gerar CSV + grafico (no perfil de render)."""
     if not caminho_excel.exists():
         raise SystemExit(f"Arquivo nao encontrado: {caminho_excel}")
 
@@ -180,45 +630,552 @@ def fluxo_interativo(caminho_excel: Path) -> None:
         sufixo = f" - {area}" if area else ""
         print(f"  [{idx}] {aba}{sufixo}")
 
-    escolha = input("Digite o numero da aba que deseja usar: ").strip()
     try:
-        idx_escolhido = int(escolha) - 1
-        nome_aba = abas[idx_escolhido][0]
-    except (ValueError, IndexError):
+        escolha = input("Digite o numero da aba que deseja usar: ").strip()
+    except EOFError:
+        raise SystemExit("Sem entrada para o menu. Para rodar sem interacao, use --aba (nome, numero, glob ou todas).")
+    if not escolha.isdigit() or not 1 <= int(escolha) <= len(abas):
         raise SystemExit("Escolha invalida. Execute novamente e selecione um numero da lista.")
-
-    slug_aba = slugificar(nome_aba)
-    caminho_csv = Path("PowerBI") / f"tabela_vagas_{slug_aba}.csv"
-    caminho_grafico = Path("plots") / f"grafico_vagas_{slug_aba}.png"
+    nome_aba = abas[int(escolha) - 1][0]
 
     # Carrega dados, valida geos padrao e mostra resumo.
     dados_arrumados, ordem_trimestres, area_trabalho = carregar_tabela_vagas(
         caminho_excel=caminho_excel,
         nome_aba=nome_aba,
-        linha_cabecalho=10,
-        linha_inicio_dados=12,
+        linha_cabecalho=linha_cabecalho,
+        linha_inicio_dados=linha_inicio_dados,
+        motor=motor,
+        diretorio_cache=diretorio_cache,
+        compacto=compacto,
+    )
+    mostrar_resumo(dados_arrumados, ordem_trimestres, nome_aba, area_trabalho)
+    exportar_artefatos(
+        dados_arrumados,
+        ordem_trimestres,
+        nome_aba,
+        paises=paises,
+        parquet=parquet,
+        perfil=perfil,
+        diretorio_tabelas=diretorio_tabelas,
+        diretorio_graficos=diretorio_graficos,
     )
 
-    faltantes = [geo for geo in PAISES_PADRAO if geo not in dados_arrumados["geo"].unique()]
-    if faltantes:
-        print(f"Aviso: estes geos nao foram encontrados e serao ignorados: {', '.join(faltantes)}")
-    paises_validos = [geo for geo in PAISES_PADRAO if geo in dados_arrumados["geo"].unique()]
-    if not paises_validos:
-        raise SystemExit("Nenhum geo valido restou para plotar. Ajuste os nomes e tente de novo.")
 
-    mostrar_resumo(dados_arrumados, ordem_trimestres, nome_aba, area_trabalho)
+def fluxo_lote(
+    caminho_excel: Path,
+    abas: Sequence[str] | None = None,
+    motor: str = "xml",
+    diretorio_cache: Path | None = DIRETORIO_CACHE,
+    jobs: int = 1,
+    forcar: bool = False,
+    compacto: bool = False,
+    parquet: bool = False,
+    perfil: str = PERFIL_PADRAO,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    paises: Sequence[str] = PAISES_PADRAO,
+    diretorio_tabelas: Path = DIRETORIO_TABELAS,
+    diretorio_graficos: Path = DIRETORIO_GRAFICOS,
+    particao: Tuple[int, int] | None = None,
+    renderizador: RenderizadorGrafico | None = None,
+) -> List[Tuple[str, str, float]]:
+    """
+    Processa varias abas em uma unica execucao (todas, se abas for None).
+    abas aceita os seletores de resolver_abas (nome, numero, glob ou todas); com
+    particao (I, N), so a parte I de N das abas escolhidas e processada.
+    O workbook e aberto uma vez so; no fim imprime o tempo gasto em cada aba.
+    Com jobs > 1, um pool de processos (backend Agg) le as abas em paralelo (motor xml),
+    devolvendo apenas as matrizes, e desenha os PNGs a partir das series por geo; o CSV
+    continua no processo principal. Com jobs == 1, uma unica figura matplotlib e
+    reaproveitada entre os graficos.
+    Com diretorio_cache, abas cuja impressao digital bate com o manifesto da execucao
+    anterior (e cujos arquivos ainda existem com o mesmo hash) sao puladas, a menos que forcar seja True.
+    Um renderizador ja aberto (modo observacao) e usado no lugar de uma figura nova.
+    """
+    if not caminho_excel.exists():
+        raise SystemExit(f"Arquivo nao encontrado: {caminho_excel}")
+    if jobs < 1:
+        raise SystemExit("--jobs deve ser pelo menos 1.")
+    if jobs > 1 and motor != "xml":
+        print("Aviso: com o motor pandas, --jobs so paraleliza os graficos; as abas sao lidas em um processo.")
+
+    inicio_total = time.perf_counter()
+    nomes: List[str] = []
+    manifesto: Dict[str, Dict[str, object]] = {}
+    inalteradas = set()
+    # Abas processadas nesta execucao (so as entradas delas mudam no manifesto) e entradas
+    # que esperam o grafico do pool.
+    tentadas: List[str] = []
+    aguardando: Dict[str, Dict[str, object]] = {}
+    graficos: Dict[str, Path] = {}
+    resultados: List[Tuple[str, str, float]] = []
+    # Geos pedidos que aparecem em alguma aba (as inalteradas contam pelo manifesto).
+    geos_encontrados = set()
+    try:
+        with contextlib.ExitStack() as pilha:
+            # Catalogo: nomes das abas, selecao e impressoes digitais comparadas com o manifesto.
+            with etapa("catalogo"):
+                if motor == "pandas":
+                    import pandas as pd
 
-    # Exporta artefatos finais com nomes padrao.
-    caminho_csv.parent.mkdir(parents=True, exist_ok=True)
-    dados_arrumados.to_csv(caminho_csv, index=False)
-    print(f"Tabela arrumada salva em {caminho_csv}")
+                    livro: Path | pd.ExcelFile = pilha.enter_context(pd.ExcelFile(caminho_excel))
+                    nomes_existentes = list(livro.sheet_names)
+                else:
+                    livro = caminho_excel
+                    nomes_existentes = listar_nomes_abas(caminho_excel)
+                nomes = nomes_existentes if abas is None else resolver_abas(abas, nomes_existentes)
+                if particao is not None:
+                    nomes = particionar_abas(nomes, particao)
 
-    plotar_taxa_vagas(dados_arrumados, ordem_trimestres, paises_validos, nome_aba, caminho_grafico)
-    print(f"Grafico salvo em {caminho_grafico}")
+                # Impressao digital por aba: conteudo lido + versao do formato + linhas, saidas, perfil e geos.
+                livro_xml = abrir_livro(caminho_excel)
+                opcoes_saida = "|".join(
+                    [
+                        str(VERSAO_CACHE),
+                        str(parquet),
+                        perfil,
+                        str(linha_cabecalho),
+                        str(linha_inicio_dados),
+                        str(diretorio_tabelas),
+                        str(diretorio_graficos),
+                        *paises,
+                    ]
+                )
+                sufixo_impressao = hashlib.sha1(opcoes_saida.encode("utf-8")).hexdigest()[:12]
+                impressoes_xml = {nome: f"{livro_xml.impressao_aba(nome)}|{sufixo_impressao}" for nome in nomes}
+                manifesto = carregar_manifesto(diretorio_cache, caminho_excel) if diretorio_cache is not None else {}
+                impressoes: Dict[str, str | None] = {}
+                inalteradas = set()
+                if diretorio_cache is not None:
+                    for nome_aba in nomes:
+                        anterior = manifesto.get(nome_aba, {})
+                        if anterior.get("impressao_xml") == impressoes_xml[nome_aba]:
+                            # Bytes iguais aos da ultima execucao: nem precisa ler a aba.
+                            impressoes[nome_aba] = anterior.get("impressao")
+                            continue
+                        # XML mudou (ex.: so a data da extracao em A1): decide pelo conteudo lido.
+                        try:
+                            matriz = livro_xml.ler_aba(nome_aba, linha_cabecalho, linha_inicio_dados, com_flags=True)
+                        except (KeyError, ValueError, ElementTree.ParseError, zipfile.BadZipFile):
+                            # A aba e refeita e o erro aparece no resumo do lote.
+                            impressoes[nome_aba] = None
+                            continue
+                        impressoes[nome_aba] = f"{impressao_matriz(matriz)}|{sufixo_impressao}"
+                        if motor == "xml" and anterior.get("impressao") != impressoes[nome_aba]:
+                            # Aba que vai ser refeita: a leitura da carga sai do cache.
+                            salvar_matriz_cache(
+                                diretorio_cache, caminho_excel, nome_aba, matriz, linha_cabecalho, linha_inicio_dados
+                            )
+                if diretorio_cache is not None and not forcar:
+                    for nome_aba in nomes:
+                        anterior = manifesto.get(nome_aba, {})
+                        # Alem da entrada igual, as saidas precisam estar no disco com o conteudo gravado.
+                        impressao = impressoes[nome_aba]
+                        if (
+                            impressao is not None
+                            and anterior.get("impressao") == impressao
+                            and "geos" in anterior
+                            and saidas_conferem(anterior.get("arquivos"))
+                        ):
+                            inalteradas.add(nome_aba)
+                            geos_encontrados.update(anterior["geos"])
+                pendentes = [nome for nome in nomes if nome not in inalteradas]
+
+            futuros: Dict[str, Future] = {}
+            desenhista: RenderizadorGrafico | PoolGraficos
+            if jobs > 1 and pendentes:
+                # O mesmo pool le as abas e desenha os graficos; as leituras entram primeiro na fila.
+                executor = pilha.enter_context(
+                    ProcessPoolExecutor(max_workers=jobs, initializer=iniciar_processo_grafico)
+                )
+                if motor == "xml":
+                    futuros = {
+                        nome_aba: executor.submit(
+                            _ler_matriz_cronometrada,
+                            caminho_excel,
+                            nome_aba,
+                            diretorio_cache,
+                            linha_cabecalho,
+                            linha_inicio_dados,
+                        )
+                        for nome_aba in pendentes
+                    }
+                desenhista = PoolGraficos(executor, perfil)
+            elif renderizador is not None and renderizador.perfil == perfil:
+                desenhista = renderizador
+            else:
+                # Uma unica figura reaproveitada para todos os graficos do lote.
+                desenhista = pilha.enter_context(RenderizadorGrafico(perfil))
+
+            for nome_aba in nomes:
+                if nome_aba in inalteradas:
+                    resultados.append((nome_aba, "inalterada", 0.0))
+                    continue
+                # A entrada antiga sai ja: so volta ao manifesto se a aba terminar sem erro.
+                tentadas.append(nome_aba)
+                manifesto.pop(nome_aba, None)
+                inicio = time.perf_counter()
+                arquivos: List[str] = []
+                try:
+                    if futuros:
+                        # Conta o tempo de leitura do processo filho, nao a espera na fila.
+                        matriz, segundos_leitura = futuros[nome_aba].result()
+                        inicio = time.perf_counter() - segundos_leitura
+                        with etapa("arrumacao", nome_aba):
+                            dados_arrumados = tabela_longa_da_matriz(matriz, compacto)
+                        ordem_trimestres = list(matriz.trimestres)
+                    else:
+                        dados_arrumados, ordem_trimestres, _ = carregar_tabela_vagas(
+                            livro,
+                            nome_aba,
+                            linha_cabecalho,
+                            linha_inicio_dados,
+                            motor=motor,
+                            diretorio_cache=diretorio_cache,
+                            compacto=compacto,
+                        )
+                    geos_aba = sorted(set(paises) & set(dados_arrumados["geo"].unique()))
+                    geos_encontrados.update(geos_aba)
+                    if dados_arrumados.empty:
+                        status = "sem dados"
+                    elif not geos_aba:
+                        # Aba sem nenhum dos geos pedidos: nada a exportar, mas nao e falha.
+                        status = "sem geos"
+                    else:
+                        gerados = exportar_artefatos(
+                            dados_arrumados,
+                            ordem_trimestres,
+                            nome_aba,
+                            paises=paises,
+                            verbose=False,
+                            parquet=parquet,
+                            renderizador=desenhista,
+                            diretorio_tabelas=diretorio_tabelas,
+                            diretorio_graficos=diretorio_graficos,
+                        )
+                        arquivos = [str(caminho) for caminho in gerados]
+                        # O PNG e sempre o ultimo arquivo de exportar_artefatos.
+                        graficos[nome_aba] = gerados[-1]
+                        status = "ok"
+                    entrada = {
+                        "impressao": impressoes.get(nome_aba),
+                        "impressao_xml": impressoes_xml[nome_aba],
+                        "geos": geos_aba,
+                        "arquivos": arquivos,
+                    }
+                    if isinstance(desenhista, PoolGraficos) and nome_aba in graficos:
+                        # Com o pool, o grafico so esta garantido depois de concluir().
+                        aguardando[nome_aba] = entrada
+                    else:
+                        manifesto[nome_aba] = entrada
+                except (
+                    SystemExit,
+                    ValueError,
+                    KeyError,
+                    IndexError,
+                    OSError,
+                    zipfile.BadZipFile,
+                    ElementTree.ParseError,
+                ) as exc:
+                    # Aba com XML quebrado, arquivo sumido ou saida sem permissao: registra e segue o lote.
+                    status = f"erro: {exc}"
+                resultados.append((nome_aba, status, time.perf_counter() - inicio))
+
+            if isinstance(desenhista, PoolGraficos):
+                # Soma o tempo de desenho no processo filho; so aba com grafico desenhado entra no manifesto.
+                desenhos = desenhista.concluir()
+                for posicao, (nome_aba, status, segundos) in enumerate(resultados):
+                    desenho = desenhos.get(graficos.get(nome_aba))
+                    if isinstance(desenho, BaseException):
+                        resultados[posicao] = (nome_aba, f"erro no grafico: {desenho}", segundos)
+                        continue
+                    if desenho is not None:
+                        resultados[posicao] = (nome_aba, status, segundos + desenho)
+                    if nome_aba in aguardando:
+                        manifesto[nome_aba] = aguardando[nome_aba]
+
+    finally:
+        # Grava o manifesto mesmo se o lote parar no meio (erro inesperado ou Ctrl+C).
+        if diretorio_cache is not None and tentadas:
+            # Rele o manifesto antes de gravar: outra particao pode ter gravado as abas dela nesse meio tempo.
+            atual = carregar_manifesto(diretorio_cache, caminho_excel)
+            for nome_aba in tentadas:
+                entrada = manifesto.get(nome_aba)
+                if entrada is None:
+                    atual.pop(nome_aba, None)
+                    continue
+                try:
+                    # Hash das saidas depois do pool: os graficos do processo filho ja estao gravados.
+                    atual[nome_aba] = {
+                        "impressao": entrada["impressao"],
+                        "impressao_xml": entrada["impressao_xml"],
+                        "geos": entrada["geos"],
+                        "arquivos": assinar_saidas(entrada["arquivos"]),
+                    }
+                except OSError:
+                    # Saida que sumiu no meio do caminho: a aba e refeita na proxima execucao.
+                    atual.pop(nome_aba, None)
+            salvar_manifesto(diretorio_cache, caminho_excel, atual)
+
+    print("\nResumo do lote")
+    print("--------------")
+    for nome_aba, status, segundos in resultados:
+        print(f"  {nome_aba:<20} {segundos:7.2f}s  {status}")
+    gerados = sum(1 for _, status, _ in resultados if status == "ok")
+    com_erro = sum(1 for _, status, _ in resultados if status.startswith("erro"))
+    refeitas = [nome_aba for nome_aba, status, _ in resultados if status != "inalterada"]
+    if inalteradas:
+        print(f"Abas refeitas: {', '.join(refeitas) if refeitas else 'nenhuma'} ({len(inalteradas)} inalteradas)")
+    tamanhos = [caminho.stat().st_size for caminho in graficos.values() if caminho.exists()]
+    if tamanhos:
+        print(
+            f"Graficos no perfil {perfil}: {len(tamanhos)} arquivos, "
+            f"{sum(tamanhos) / len(tamanhos) / 1024:.0f} KB em media"
+        )
+    print(
+        f"{len(resultados)} abas: {gerados} geradas, {len(inalteradas)} inalteradas, {com_erro} com erro, "
+        f"{len(resultados) - gerados - len(inalteradas) - com_erro} sem dados/geos "
+        f"em {time.perf_counter() - inicio_total:.2f}s"
+    )
+    ausentes = [geo for geo in paises if geo not in geos_encontrados]
+    if ausentes and com_erro < len(resultados):
+        if len(ausentes) == len(paises):
+            # Provavel erro de digitacao em --geos: o agendador precisa ver a falha.
+            raise SystemExit(f"Nenhum dos geos pedidos existe nas abas processadas: {', '.join(ausentes)}")
+        print(f"Aviso: geos pedidos que nao aparecem em nenhuma aba: {', '.join(ausentes)}")
+    return resultados
+
+
+def fluxo_observar(
+    caminho_excel: Path,
+    abas: Sequence[str] | None = None,
+    intervalo: float = INTERVALO_PADRAO,
+    perfil: str = PERFIL_PADRAO,
+    **opcoes_lote: object,
+) -> None:
+    """
+    Modo observacao: roda o modo lote para caminho_excel e fica vigiando o diretorio dele.
+    Cada XLSX que chega ou muda dispara o modo lote para esse arquivo; pelo manifesto, so as
+    abas alteradas sao refeitas. O processo fica vivo entre as rodadas, entao os imports, o
+    workbook aberto, o hash do arquivo e a figura do matplotlib continuam quentes.
+    """
+    diretorio = caminho_excel.parent
+    if not diretorio.is_dir():
+        raise SystemExit(f"Diretorio nao encontrado: {diretorio}")
+    if intervalo <= 0:
+        raise SystemExit("--intervalo deve ser maior que zero.")
+
+    with RenderizadorGrafico(perfil) as renderizador:
+
+        def processar(caminho: Path) -> None:
+            if not zipfile.is_zipfile(caminho):
+                # Copia ainda em andamento: o arquivo muda de novo e volta a ser entregue.
+                print(f"{caminho} ainda nao e um XLSX completo; aguardando.")
+                return
+            try:
+                fluxo_lote(caminho, abas, perfil=perfil, renderizador=renderizador, **opcoes_lote)
+            except SystemExit as exc:
+                print(f"Falha ao processar {caminho}: {exc}")
+            except Exception as exc:
+                # Uma rodada com erro (ex.: XLSX corrompido) nao derruba a observacao.
+                print(f"Falha ao processar {caminho}: {type(exc).__name__}: {exc}")
+
+        # A foto do diretorio vem antes da rodada inicial: um XLSX que chega ou muda enquanto
+        # ela roda fica diferente da foto e e entregue na primeira verificacao.
+        iniciais = assinaturas_arquivos(diretorio)
+        if caminho_excel.exists():
+            processar(caminho_excel)
+        print(f"\nObservando {diretorio}/*.xlsx a cada {intervalo:g}s (Ctrl+C para sair)")
+        try:
+            for caminho in observar_arquivos(diretorio, intervalo, iniciais=iniciais):
+                print(f"\n[{time.strftime('%H:%M:%S')}] Arquivo novo ou alterado: {caminho}")
+                inicio = time.perf_counter()
+                processar(caminho)
+                print(f"Rodada concluida em {time.perf_counter() - inicio:.2f}s")
+        except KeyboardInterrupt:
+            print("\nObservacao encerrada.")
 
 
 def main() -> None:
-    fluxo_interativo(ARQUIVO_PADRAO)
+    parser = argparse.ArgumentParser(description="Gera CSV arrumado e grafico a partir do XLSX da Eurostat.")
+    parser.add_argument(
+        "--arquivo", type=Path, default=ARQUIVO_PADRAO, help=f"XLSX da Eurostat (padrao: {ARQUIVO_PADRAO})."
+    )
+    parser.add_argument(
+        "--aba",
+        "--abas",
+        dest="abas",
+        nargs="+",
+        metavar="ABA",
+        help='Abas do modo lote (sem menu): nome, numero do menu, glob (ex.: "Sheet 1*") ou todas.',
+    )
+    parser.add_argument("--todas", action="store_true", help="Processa todas as abas em modo lote (= --aba todas).")
+    parser.add_argument("--listar-abas", action="store_true", help="Lista as abas numeradas (com a area C7) e sai.")
+    parser.add_argument(
+        "--observar",
+        action="store_true",
+        help="Fica vigiando o diretorio do XLSX e refaz as abas alteradas a cada arquivo novo (Ctrl+C para sair).",
+    )
+    parser.add_argument(
+        "--intervalo",
+        type=float,
+        default=INTERVALO_PADRAO,
+        metavar="SEG",
+        help=f"Intervalo entre verificacoes no modo observacao (padrao: {INTERVALO_PADRAO:g}s).",
+    )
+    parser.add_argument(
+        "--servir",
+        action="store_true",
+        help="Sobe um servidor HTTP local com as tabelas (JSON/CSV) e os graficos em memoria (Ctrl+C para sair).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Endereco do servidor (padrao: 127.0.0.1).")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta do servidor (padrao: 8765).")
+    parser.add_argument(
+        "--particao",
+        type=ler_particao,
+        metavar="I/N",
+        help="Processa so a parte I de N das abas escolhidas (para dividir o lote entre maquinas).",
+    )
+    parser.add_argument("--linha-cabecalho", type=int, default=10, help="Linha do cabecalho (zero-based, padrao: 10).")
+    parser.add_argument("--linha-dados", type=int, default=12, help="Primeira linha de dados (zero-based, padrao: 12).")
+    parser.add_argument("--geos", nargs="+", metavar="GEO", default=PAISES_PADRAO, help="Geos do grafico.")
+    parser.add_argument(
+        "--saida-tabelas",
+        type=Path,
+        default=DIRETORIO_TABELAS,
+        help=f"Diretorio dos CSV/Parquet, do esquema estrela e do SQLite (padrao: {DIRETORIO_TABELAS}).",
+    )
+    parser.add_argument(
+        "--saida-graficos",
+        type=Path,
+        default=DIRETORIO_GRAFICOS,
+        help=f"Diretorio dos graficos (padrao: {DIRETORIO_GRAFICOS}).",
+    )
+    parser.add_argument("--motor", choices=MOTORES, default="xml", help="Leitor do XLSX (padrao: xml em streaming).")
+    parser.add_argument("--sem-cache", action="store_true", help="Nao le nem grava o cache em .cache/.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Processos para ler as abas e desenhar os graficos no modo lote.",
+    )
+    parser.add_argument("--forcar", action="store_true", help="Refaz todas as abas, mesmo as que nao mudaram.")
+    parser.add_argument(
+        "--compacto", action="store_true", help="Tipos enxutos em memoria (geo categoria, trimestre int16, float32)."
+    )
+    parser.add_argument("--parquet", action="store_true", help="Tambem grava a tabela em Parquet (requer pyarrow).")
+    parser.add_argument(
+        "--perfil",
+        choices=list(PERFIS_RENDER),
+        default=PERFIL_PADRAO,
+        help="Perfil do grafico: "
+        + "; ".join(f"{nome} = {dados.descricao}" for nome, dados in PERFIS_RENDER.items()),
+    )
+    parser.add_argument(
+        "--salvar-cubo", action="store_true", help=f"Grava o cubo de todas as abas em {ARQUIVO_CUBO} (memory-map)."
+    )
+    parser.add_argument(
+        "--estrela", action="store_true", help="Grava fato + dimensoes de todas as abas em <saida-tabelas>/estrela/."
+    )
+    parser.add_argument(
+        "--sqlite", action="store_true", help="Grava todas as abas no banco <saida-tabelas>/vagas.sqlite."
+    )
+    parser.add_argument(
+        "--medir",
+        action="store_true",
+        help="Mede parede, CPU e pico de memoria de cada etapa (catalogo, carga, arrumacao, validacao, "
+        "exportacao, grafico) e imprime a tabela no fim.",
+    )
+    parser.add_argument(
+        "--medir-json", type=Path, metavar="ARQ", help="Grava as medidas por etapa em JSON (liga --medir)."
+    )
+    parser.add_argument(
+        "--medir-sem-memoria",
+        action="store_true",
+        help="Mede sem tracemalloc, que deixa as alocacoes Python bem mais lentas (liga --medir).",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="DIR",
+        help="Grava um dump do cProfile por etapa em DIR/<etapa>.prof (liga --medir).",
+    )
+    args = parser.parse_args()
+
+    caminho_excel = args.arquivo
+    # No modo observacao o XLSX pode ainda nao ter chegado.
+    if not caminho_excel.exists() and not args.observar:
+        raise SystemExit(f"Arquivo nao encontrado: {caminho_excel}")
+    if args.listar_abas:
+        for idx, (aba, area) in enumerate(listar_abas_excel(caminho_excel), start=1):
+            print(f"{idx}\t{aba}\t{area or ''}")
+        return
+
+    medicao = (
+        medir_etapas(args.medir_json, args.cprofile, memoria=not args.medir_sem_memoria)
+        if args.medir or args.medir_json or args.cprofile or args.medir_sem_memoria
+        else contextlib.nullcontext()
+    )
+    with medicao:
+        diretorio_cache = None if args.sem_cache else DIRETORIO_CACHE
+        if args.servir:
+            # Importado so aqui: o servidor importa este modulo.
+            from servidor_vagas import servir
+
+            servir(
+                caminho_excel,
+                args.host,
+                args.porta,
+                diretorio_cache=diretorio_cache,
+                paises=args.geos,
+                perfil=args.perfil,
+                linha_cabecalho=args.linha_cabecalho,
+                linha_inicio_dados=args.linha_dados,
+            )
+            return
+        if args.salvar_cubo:
+            gerar_cubo_persistido(caminho_excel, diretorio_cache=diretorio_cache, jobs=args.jobs)
+        if args.estrela:
+            gerar_esquema_estrela(caminho_excel, args.saida_tabelas / DIRETORIO_ESTRELA.name, parquet=args.parquet)
+        if args.sqlite:
+            gerar_banco_sqlite(caminho_excel, args.saida_tabelas / ARQUIVO_SQLITE.name)
+        opcoes = dict(
+            motor=args.motor,
+            diretorio_cache=diretorio_cache,
+            compacto=args.compacto,
+            parquet=args.parquet,
+            perfil=args.perfil,
+            linha_cabecalho=args.linha_cabecalho,
+            linha_inicio_dados=args.linha_dados,
+            paises=args.geos,
+            diretorio_tabelas=args.saida_tabelas,
+            diretorio_graficos=args.saida_graficos,
+        )
+        if args.observar:
+            fluxo_observar(
+                caminho_excel,
+                None if args.todas else args.abas,
+                intervalo=args.intervalo,
+                jobs=args.jobs,
+                forcar=args.forcar,
+                particao=args.particao,
+                **opcoes,
+            )
+        elif args.todas or args.abas or args.particao:
+            resultados = fluxo_lote(
+                caminho_excel,
+                None if args.todas else args.abas,
+                jobs=args.jobs,
+                forcar=args.forcar,
+                particao=args.particao,
+                **opcoes,
+            )
+            # Codigo de saida 1 se alguma aba falhou, para o agendador perceber.
+            if any(status.startswith("erro") for _, status, _ in resultados):
+                raise SystemExit(1)
+        elif not (args.salvar_cubo or args.estrela or args.sqlite):
+            fluxo_interativo(caminho_excel, **opcoes)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+"""
+Desenho dos graficos de linhas (matplotlib) a partir de series ja prontas por geo.
+- desenhar_grafico: cria uma figura nova por grafico (fluxo interativo)
+- RenderizadorGrafico: reaproveita uma unica figura/eixo no modo lote, trocando
+  apenas os dados das linhas, rotulos e legenda entre uma aba e outra
+- PoolGraficos: mesmo contrato do RenderizadorGrafico, mas cada grafico vai para um
+  pool de processos com backend Agg (cada processo tem o proprio RenderizadorGrafico);
+  os processos recebem so as series por geo, nunca as tabelas
+- PERFIS_RENDER: formatos de saida (previa PNG leve, PNG de publicacao, SVG e PDF vetoriais);
+  cada arquivo guarda a impressao das entradas do grafico para nao ser redesenhado a toa
+O matplotlib so e importado no primeiro desenho, entao importar este modulo e barato.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from exportar_vagas import ler_textos_png
+
+
+# (geo, rotulos de trimestre, taxas) de uma linha do grafico.
+Serie = Tuple[str, List[str], List[float]]
+
+TAMANHO_FIGURA = (10, 5)
+# Chave (PNG) ou prefixo (SVG/PDF) da impressao das entradas gravada no arquivo do grafico.
+CHAVE_IMPRESSAO = "impressao_vagas"
+_IMPRESSAO_VETORIAL = re.compile(rb"impressao_vagas=([0-9a-f]{64})")
+
+
+class PerfilRender(NamedTuple):
+    """Formato do arquivo (png/svg/pdf), dpi, sufixo no nome do arquivo e descricao para a ajuda."""
+
+    formato: str
+    dpi: int
+    sufixo: str
+    descricao: str
+
+
+PERFIS_RENDER: Dict[str, PerfilRender] = {
+    "publicacao": PerfilRender("png", 300, "", "PNG 300 dpi (padrao)"),
+    "previa": PerfilRender("png", 72, "_previa", "PNG 72 dpi para conferencia rapida"),
+    "svg": PerfilRender("svg", 72, "", "SVG vetorial (web/edicao)"),
+    "pdf": PerfilRender("pdf", 72, "", "PDF vetorial (relatorios)"),
+}
+PERFIL_PADRAO = "publicacao"
+
+
+def perfil_render(nome: str) -> PerfilRender:
+    """Retorna o perfil pelo nome (ValueError se nao existir)."""
+    try:
+        return PERFIS_RENDER[nome]
+    except KeyError:
+        raise ValueError(f"Perfil desconhecido: {nome} (use um de {', '.join(PERFIS_RENDER)})") from None
+
+
+def caminho_grafico(diretorio: Path, nome_base: str, perfil: str = PERFIL_PADRAO) -> Path:
+    """Arquivo do grafico no perfil: <nome_base><sufixo>.<formato>."""
+    dados_perfil = perfil_render(perfil)
+    return diretorio / f"{nome_base}{dados_perfil.sufixo}.{dados_perfil.formato}"
+
+
+def _metadados(formato: str, impressao: str) -> Dict[str, str | None]:
+    if formato == "png":
+        return {CHAVE_IMPRESSAO: impressao}
+    # SVG/PDF so aceitam chaves fixas; sem data, o mesmo grafico gera o mesmo arquivo.
+    campo, campo_data = ("Description", "Date") if formato == "svg" else ("Subject", "CreationDate")
+    return {campo: f"{CHAVE_IMPRESSAO}={impressao}", campo_data: None}
+
+
+def ler_impressao_grafico(caminho: Path) -> str | None:
+    """Impressao das entradas gravada no grafico (None se o arquivo nao existir ou nao tiver)."""
+    if caminho.suffix == ".png":
+        return ler_textos_png(caminho).get(CHAVE_IMPRESSAO)
+    try:
+        achado = _IMPRESSAO_VETORIAL.search(caminho.read_bytes())
+    except OSError:
+        return None
+    return achado.group(1).decode("ascii") if achado else None
+
+
+def _configurar_eixo(ax, titulo: str) -> None:
+    ax.set_title(titulo)
+    ax.set_ylabel("Taxa de vagas (%)")
+    ax.set_xlabel("Trimestre")
+    ax.grid(True, alpha=0.3)
+
+
+def _salvar_figura(fig, caminho_saida: Path, perfil: str, impressao: str) -> None:
+    """savefig em arquivo temporario + rename, para nunca deixar um grafico pela metade."""
+    import matplotlib.pyplot as plt
+
+    dados_perfil = perfil_render(perfil)
+    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho_saida.with_name(f".{caminho_saida.name}.{os.getpid()}.tmp")
+    # Sal fixo nos ids do SVG para o arquivo ser reproduzivel.
+    with plt.rc_context({"svg.hashsalt": CHAVE_IMPRESSAO}):
+        fig.savefig(
+            temporario,
+            dpi=dados_perfil.dpi,
+            format=dados_perfil.formato,
+            metadata=_metadados(dados_perfil.formato, impressao),
+        )
+    os.replace(temporario, caminho_saida)
+
+
+def desenhar_grafico(
+    series: Sequence[Serie],
+    titulo: str,
+    caminho_saida: Path,
+    impressao: str,
+    perfil: str = PERFIL_PADRAO,
+) -> None:
+    """Desenha o grafico de linhas em uma figura nova e a fecha em seguida."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=TAMANHO_FIGURA)
+    for geo, trimestres, taxas in series:
+        ax.plot(trimestres, taxas, marker="o", label=geo)
+    _configurar_eixo(ax, titulo)
+    ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
+    fig.tight_layout()
+    _salvar_figura(fig, caminho_saida, perfil, impressao)
+    plt.close(fig)
+
+
+class RenderizadorGrafico:
+    """
+    Mantem uma figura aberta entre graficos do modo lote.
+    As linhas existentes recebem novos dados (set_data) e o tight_layout so roda de novo
+    quando algo que mexe no layout muda (geos da legenda, trimestres ou largura do eixo y).
+    """
+
+    def __init__(self, perfil: str = PERFIL_PADRAO) -> None:
+        perfil_render(perfil)
+        self.perfil = perfil
+        self._fig = None
+        self._ax = None
+        self._linhas: List = []
+        self._chave_layout: Tuple | None = None
+
+    def desenhar(self, series: Sequence[Serie], titulo: str, caminho_saida: Path, impressao: str) -> None:
+        if self._fig is None:
+            import matplotlib.pyplot as plt
+
+            self._fig, self._ax = plt.subplots(figsize=TAMANHO_FIGURA)
+            _configurar_eixo(self._ax, titulo)
+        ax = self._ax
+
+        # Eixo x categorico feito a mao: posicoes na ordem de aparicao, como o matplotlib faria.
+        rotulos = list(dict.fromkeys(rotulo for _, trimestres, _ in series for rotulo in trimestres))
+        posicao = {rotulo: idx for idx, rotulo in enumerate(rotulos)}
+        for idx, (geo, trimestres, taxas) in enumerate(series):
+            x = [posicao[rotulo] for rotulo in trimestres]
+            if idx < len(self._linhas):
+                self._linhas[idx].set_data(x, taxas)
+                self._linhas[idx].set_label(geo)
+            else:
+                # Cor fixa pela posicao: linhas removidas nao podem deslocar o ciclo de cores.
+                (linha,) = ax.plot(x, taxas, marker="o", label=geo, color=f"C{idx % 10}")
+                self._linhas.append(linha)
+        for linha in self._linhas[len(series) :]:
+            linha.remove()
+        del self._linhas[len(series) :]
+
+        ax.set_xticks(range(len(rotulos)), rotulos)
+        ax.set_title(titulo)
+        ax.relim()
+        ax.autoscale_view()
+        ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
+
+        rotulos_y = ax.yaxis.get_major_formatter().format_ticks(ax.get_yticks())
+        chave_layout = (tuple(geo for geo, _, _ in series), tuple(rotulos), max(map(len, rotulos_y), default=0))
+        if chave_layout != self._chave_layout:
+            self._fig.tight_layout()
+            self._chave_layout = chave_layout
+        _salvar_figura(self._fig, caminho_saida, self.perfil, impressao)
+
+    def fechar(self) -> None:
+        if self._fig is not None:
+            import matplotlib.pyplot as plt
+
+            plt.close(self._fig)
+        self._fig = self._ax = None
+        self._linhas = []
+        self._chave_layout = None
+
+    def __enter__(self) -> "RenderizadorGrafico":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.fechar()
+
+
+# Renderizadores de cada processo do pool, um por perfil (figura reaproveitada no processo).
+_renderizadores_processo: Dict[str, RenderizadorGrafico] = {}
+
+
+def iniciar_processo_grafico() -> None:
+    """Initializer dos processos do pool: backend Agg (sem janela)."""
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+
+
+def _desenhar_no_processo(series: List[Serie], titulo: str, caminho_saida: Path, impressao: str, perfil: str) -> float:
+    """Tarefa dos processos do pool: desenha o grafico e devolve o tempo gasto."""
+    inicio = time.perf_counter()
+    if perfil not in _renderizadores_processo:
+        _renderizadores_processo[perfil] = RenderizadorGrafico(perfil)
+    _renderizadores_processo[perfil].desenhar(series, titulo, caminho_saida, impressao)
+    return time.perf_counter() - inicio
+
+
+class PoolGraficos:
+    """
+    Envia os graficos para um executor de processos (iniciado com iniciar_processo_grafico).
+    desenhar so agenda o trabalho; concluir espera todos e devolve tempo ou erro por arquivo.
+    """
+
+    def __init__(self, executor: Executor, perfil: str = PERFIL_PADRAO) -> None:
+        perfil_render(perfil)
+        self._executor = executor
+        self.perfil = perfil
+        self._pendentes: Dict[Path, Future] = {}
+
+    def desenhar(self, series: Sequence[Serie], titulo: str, caminho_saida: Path, impressao: str) -> None:
+        self._pendentes[caminho_saida] = self._executor.submit(
+            _desenhar_no_processo, list(series), titulo, caminho_saida, impressao, self.perfil
+        )
+
+    def concluir(self) -> Dict[Path, float | BaseException]:
+        """Espera os graficos agendados: {caminho: segundos no processo filho ou a excecao}."""
+        resultados: Dict[Path, float | BaseException] = {}
+        for caminho, futuro in self._pendentes.items():
+            try:
+                resultados[caminho] = futuro.result()
+            except Exception as exc:
+                resultados[caminho] = exc
+        self._pendentes = {}
+        return resultados
@@ -0,0 +1,370 @@
+"""
+Leitor enxuto do XLSX da Eurostat, sem passar por pd.read_excel.
+- Le xl/worksheets/sheetN.xml em streaming (iterparse), linha a linha
+- Pula as linhas antes do cabecalho (exceto a linha 7, onde fica a area em C7)
+- Decodifica apenas a coluna geo e as colunas de valor (flags sao ignoradas)
+- Devolve os valores ja como matriz numerica (geo x trimestre)
+- Para no fim do bloco de dados (linha vazia ou legenda "Special value"), sem ler o rodape
+
+Para o catalogo de abas, ler_area_aba para de ler cada parte XML assim que passa da linha 7.
+LivroXlsx mantem o arquivo aberto e decodifica as strings compartilhadas uma vez por workbook.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+
+NS_PLANILHA = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_RELACAO_DOC = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_RELACAO_PACOTE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+TAG_LINHA = f"{NS_PLANILHA}row"
+TAG_CELULA = f"{NS_PLANILHA}c"
+TAG_VALOR = f"{NS_PLANILHA}v"
+TAG_TEXTO = f"{NS_PLANILHA}t"
+TAG_INLINE = f"{NS_PLANILHA}is"
+
+# Linha (zero-based) e coluna da celula C7 com a area/industria.
+LINHA_AREA = 6
+COLUNA_AREA = 2
+
+# Primeira linha da legenda que a Eurostat coloca abaixo dos dados (depois de uma linha vazia).
+MARCADOR_RODAPE = "Special value"
+
+_REF_CELULA = re.compile(r"([A-Z]+)(\d+)")
+
+
+class MatrizAba(NamedTuple):
+    """
+    Conteudo util de uma aba: geos, trimestres, valores (geo x trimestre) e area C7.
+    flags (geo x trimestre, texto ou None) so e preenchido quando pedido com com_flags.
+    """
+
+    geos: List[str]
+    trimestres: List[str]
+    valores: np.ndarray
+    area: str | None
+    flags: np.ndarray | None = None
+
+
+def impressao_matriz(matriz: MatrizAba) -> str:
+    """
+    Impressao digital do conteudo lido da aba: area C7, trimestres, geos, valores e flags.
+    O resto da aba (data da extracao em A1, "Last updated") fica de fora, entao um novo
+    download com os mesmos dados tem a mesma impressao.
+    """
+    digest = hashlib.sha1()
+    rotulos = [matriz.area, list(matriz.trimestres), list(matriz.geos), list(matriz.valores.shape)]
+    digest.update(json.dumps(rotulos, ensure_ascii=False).encode("utf-8"))
+    digest.update(np.ascontiguousarray(matriz.valores, dtype=np.float64).tobytes())
+    if matriz.flags is not None:
+        digest.update(json.dumps(matriz.flags.tolist(), ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def indice_coluna(letras: str) -> int:
+    """Converte letras de coluna do Excel (A, B, ..., AA) em indice zero-based."""
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + (ord(letra) - 64)
+    return indice - 1
+
+
+def mapear_partes_abas(arquivo_zip: zipfile.ZipFile) -> Dict[str, str]:
+    """Retorna {nome da aba: caminho da parte XML} na ordem do workbook."""
+    relacoes = ElementTree.fromstring(arquivo_zip.read("xl/_rels/workbook.xml.rels"))
+    alvos: Dict[str, str] = {}
+    for relacao in relacoes.iter(f"{NS_RELACAO_PACOTE}Relationship"):
+        alvo = relacao.get("Target", "")
+        if alvo.startswith("/"):
+            alvos[relacao.get("Id", "")] = alvo.lstrip("/")
+        else:
+            alvos[relacao.get("Id", "")] = posixpath.normpath(posixpath.join("xl", alvo))
+
+    livro = ElementTree.fromstring(arquivo_zip.read("xl/workbook.xml"))
+    partes: Dict[str, str] = {}
+    for aba in livro.iter(f"{NS_PLANILHA}sheet"):
+        partes[aba.get("name", "")] = alvos[aba.get(f"{NS_RELACAO_DOC}id", "")]
+    return partes
+
+
+def ler_strings_compartilhadas(arquivo_zip: zipfile.ZipFile) -> List[str]:
+    """Decodifica xl/sharedStrings.xml (vazio se o workbook nao tiver a tabela)."""
+    try:
+        conteudo = arquivo_zip.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings: List[str] = []
+    with conteudo:
+        for _, elem in ElementTree.iterparse(conteudo, events=("end",)):
+            if elem.tag == f"{NS_PLANILHA}si":
+                strings.append("".join(texto.text or "" for texto in elem.iter(TAG_TEXTO)))
+                elem.clear()
+    return strings
+
+
+def texto_celula(celula: ElementTree.Element, strings: Sequence[str]) -> str | None:
+    """Texto bruto da celula; None quando vazia (como o NaN do pandas)."""
+    tipo = celula.get("t")
+    if tipo == "inlineStr":
+        inline = celula.find(TAG_INLINE)
+        texto = "" if inline is None else "".join(t.text or "" for t in inline.iter(TAG_TEXTO))
+    else:
+        valor = celula.find(TAG_VALOR)
+        if valor is None or valor.text is None:
+            return None
+        texto = strings[int(valor.text)] if tipo == "s" else valor.text
+    return texto if texto != "" else None
+
+
+def numero_celula(celula: ElementTree.Element, strings: Sequence[str]) -> float:
+    """Valor numerico da celula; ':' e textos nao numericos viram NaN."""
+    if celula.get("t") in (None, "n"):
+        valor = celula.find(TAG_VALOR)
+        if valor is not None and valor.text:
+            return float(valor.text)
+        return np.nan
+    texto = texto_celula(celula, strings)
+    if texto is None:
+        return np.nan
+    try:
+        return float(texto)
+    except ValueError:
+        return np.nan
+
+
+def _posicao(celula: ElementTree.Element, anterior: int) -> int:
+    ref = celula.get("r")
+    if not ref:
+        return anterior + 1
+    return indice_coluna(_REF_CELULA.match(ref).group(1))
+
+
+def ler_matriz_aba(
+    arquivo_zip: zipfile.ZipFile,
+    parte_xml: str,
+    strings: Sequence[str],
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+    com_flags: bool = False,
+) -> MatrizAba:
+    """
+    Percorre a parte XML de uma aba em streaming e monta a MatrizAba.
+    Com com_flags, tambem decodifica a coluna de flag (logo a direita de cada trimestre).
+    O bloco de dados termina na primeira linha sem geo (vazia ou ausente do XML) depois dos
+    geos, ou na legenda do rodape; o resto da aba nao e lido.
+    """
+    area: str | None = None
+    trimestres: List[str] = []
+    colunas_valor: Dict[int, int] = {}
+    colunas_flag: Dict[int, int] = {}
+    geos: List[str] = []
+    linhas_valor: List[np.ndarray] = []
+    linhas_flag: List[np.ndarray] = []
+
+    with arquivo_zip.open(parte_xml) as conteudo:
+        numero_linha = -1
+        ultima_linha_dados = -1
+        for _, elem in ElementTree.iterparse(conteudo, events=("end",)):
+            if elem.tag != TAG_LINHA:
+                continue
+            ref_linha = elem.get("r")
+            numero_linha = int(ref_linha) - 1 if ref_linha else numero_linha + 1
+
+            if numero_linha == LINHA_AREA:
+                coluna = -1
+                for celula in elem.iter(TAG_CELULA):
+                    coluna = _posicao(celula, coluna)
+                    if coluna == COLUNA_AREA:
+                        area = texto_celula(celula, strings)
+                        break
+
+            elif numero_linha == linha_cabecalho:
+                # Cabecalho vazio e a coluna de flag do trimestre anterior.
+                coluna = -1
+                for celula in elem.iter(TAG_CELULA):
+                    coluna = _posicao(celula, coluna)
+                    if coluna == 0:
+                        continue
+                    rotulo = texto_celula(celula, strings)
+                    if rotulo is not None:
+                        colunas_valor[coluna] = len(trimestres)
+                        trimestres.append(sys.intern(rotulo))
+                if com_flags:
+                    colunas_flag = {
+                        coluna + 1: idx for coluna, idx in colunas_valor.items() if coluna + 1 not in colunas_valor
+                    }
+
+            elif numero_linha >= linha_inicio_dados:
+                if geos and numero_linha > ultima_linha_dados + 1:
+                    # Linha vazia omitida do XML: os dados acabaram.
+                    break
+                geo: str | None = None
+                linha = np.full(len(trimestres), np.nan)
+                linha_flag = np.full(len(trimestres), None, dtype=object) if com_flags else None
+                coluna = -1
+                for celula in elem.iter(TAG_CELULA):
+                    coluna = _posicao(celula, coluna)
+                    if coluna == 0:
+                        geo = texto_celula(celula, strings)
+                        if geo is None:
+                            break
+                    elif coluna in colunas_valor:
+                        linha[colunas_valor[coluna]] = numero_celula(celula, strings)
+                    elif coluna in colunas_flag:
+                        flag = texto_celula(celula, strings)
+                        linha_flag[colunas_flag[coluna]] = None if flag is None else sys.intern(flag.strip())
+                if geo == MARCADOR_RODAPE or (geo is None and geos):
+                    break
+                if geo is not None:
+                    ultima_linha_dados = numero_linha
+                    # Internar evita uma copia do nome do geo por aba em execucoes com varias abas.
+                    geos.append(sys.intern(geo))
+                    linhas_valor.append(linha)
+                    if com_flags:
+                        linhas_flag.append(linha_flag)
+
+            # Libera a linha ja processada para manter a memoria constante.
+            elem.clear()
+
+    if linhas_valor:
+        valores = np.vstack(linhas_valor)
+    else:
+        valores = np.empty((0, len(trimestres)))
+    flags = None
+    if com_flags:
+        flags = np.vstack(linhas_flag) if linhas_flag else np.empty((0, len(trimestres)), dtype=object)
+    return MatrizAba(geos, trimestres, valores, area, flags)
+
+
+def ler_area_aba(arquivo_zip: zipfile.ZipFile, parte_xml: str, strings: Sequence[str]) -> str | None:
+    """Le a celula C7 e interrompe a leitura da parte XML logo apos a linha 7."""
+    with arquivo_zip.open(parte_xml) as conteudo:
+        numero_linha = -1
+        for _, elem in ElementTree.iterparse(conteudo, events=("end",)):
+            if elem.tag != TAG_LINHA:
+                continue
+            ref_linha = elem.get("r")
+            numero_linha = int(ref_linha) - 1 if ref_linha else numero_linha + 1
+            if numero_linha > LINHA_AREA:
+                return None
+            if numero_linha == LINHA_AREA:
+                coluna = -1
+                for celula in elem.iter(TAG_CELULA):
+                    coluna = _posicao(celula, coluna)
+                    if coluna == COLUNA_AREA:
+                        return texto_celula(celula, strings)
+                return None
+            elem.clear()
+    return None
+
+
+class LivroXlsx:
+    """
+    XLSX aberto uma unica vez: o mapa de partes e a tabela de strings compartilhadas
+    sao decodificados so na primeira aba e reaproveitados (internados) nas demais.
+    """
+
+    def __init__(self, caminho_excel: Path) -> None:
+        self.caminho = Path(caminho_excel)
+        self._zip = zipfile.ZipFile(self.caminho)
+        self.partes = mapear_partes_abas(self._zip)
+        self._strings: List[str] | None = None
+
+    @property
+    def strings(self) -> List[str]:
+        if self._strings is None:
+            self._strings = [sys.intern(texto) for texto in ler_strings_compartilhadas(self._zip)]
+        return self._strings
+
+    def ler_aba(
+        self,
+        nome_aba: str,
+        linha_cabecalho: int = 10,
+        linha_inicio_dados: int = 12,
+        com_flags: bool = False,
+    ) -> MatrizAba:
+        if nome_aba not in self.partes:
+            raise KeyError(f"Aba nao encontrada no XLSX: {nome_aba}")
+        return ler_matriz_aba(
+            self._zip, self.partes[nome_aba], self.strings, linha_cabecalho, linha_inicio_dados, com_flags
+        )
+
+    def _impressao_parte(self, parte: str) -> str:
+        """CRC32 + tamanho da parte no diretorio do zip, sem descompactar ("-" se a parte nao existir)."""
+        try:
+            info = self._zip.getinfo(parte)
+        except KeyError:
+            return "-"
+        return f"{info.CRC:08x}-{info.file_size}"
+
+    def impressao_aba(self, nome_aba: str) -> str:
+        """
+        Impressao digital rapida dos bytes que a aba le: a parte XML dela, as strings compartilhadas
+        (geos, setores e trimestres podem estar la) e o mapa aba -> parte do workbook. Igual = mesmo
+        conteudo; diferente nao garante conteudo novo (a data da extracao em A1 muda a cada download),
+        e nesse caso quem decide e impressao_matriz.
+        """
+        partes = (self.partes[nome_aba], "xl/sharedStrings.xml", "xl/workbook.xml", "xl/_rels/workbook.xml.rels")
+        return "+".join(self._impressao_parte(parte) for parte in partes)
+
+    def listar_abas_areas(self) -> List[Tuple[str, str | None]]:
+        return [(nome, ler_area_aba(self._zip, parte, self.strings)) for nome, parte in self.partes.items()]
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "LivroXlsx":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@functools.lru_cache(maxsize=4)
+def _livro_aberto(caminho: str, tamanho: int, mtime_ns: int) -> LivroXlsx:
+    return LivroXlsx(Path(caminho))
+
+
+# Processos filhos (fork) nao podem dividir o descritor do zip com o pai: a posicao de leitura e compartilhada.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_livro_aberto.cache_clear)
+
+
+def abrir_livro(caminho_excel: Path) -> LivroXlsx:
+    """LivroXlsx compartilhado no processo; reaberto so quando tamanho ou mtime mudam."""
+    info = Path(caminho_excel).stat()
+    return _livro_aberto(str(Path(caminho_excel).resolve()), info.st_size, info.st_mtime_ns)
+
+
+def listar_abas_areas(caminho_excel: Path) -> List[Tuple[str, str | None]]:
+    """Retorna [(aba, area C7)] lendo so o comeco de cada aba e as strings compartilhadas uma vez."""
+    return abrir_livro(caminho_excel).listar_abas_areas()
+
+
+def listar_nomes_abas(caminho_excel: Path) -> List[str]:
+    """Nomes das abas na ordem do workbook."""
+    return list(abrir_livro(caminho_excel).partes)
+
+
+def ler_aba_xml(
+    caminho_excel: Path,
+    nome_aba: str,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+) -> MatrizAba:
+    """Le uma aba pelo nome usando o parser em streaming e o LivroXlsx do processo."""
+    return abrir_livro(caminho_excel).ler_aba(nome_aba, linha_cabecalho, linha_inicio_dados)
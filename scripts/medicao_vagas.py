@@ -0,0 +1,193 @@
+"""
+Medicao por etapa do pipeline (gerar_grafico_vagas.py --medir).
+- Etapas: catalogo, carga, arrumacao, validacao, exportacao e grafico
+- Cada etapa registra tempo de parede, tempo de CPU do processo e pico de memoria (tracemalloc)
+- No fim imprime uma tabela por etapa; opcionalmente grava JSON e um dump do cProfile por etapa
+O codigo do pipeline so marca os blocos com etapa(nome, aba); sem medidor ativo isso nao custa nada.
+Com --jobs N, a leitura e o desenho feitos nos processos filhos ficam fora da medicao.
+O import preguicoso de pandas/matplotlib entra na primeira etapa que os usa.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, NamedTuple
+
+
+ETAPAS = ("catalogo", "carga", "arrumacao", "validacao", "exportacao", "grafico")
+
+
+class MedidaEtapa(NamedTuple):
+    etapa: str
+    aba: str | None
+    parede: float
+    cpu: float
+    # Pico de memoria alocada acima do inicio da etapa, em bytes (None sem tracemalloc).
+    pico_memoria: int | None
+
+
+class _Aberta:
+    """Etapa em andamento (pilha de etapas aninhadas)."""
+
+    def __init__(self, nome: str, aba: str | None, memoria_inicial: int) -> None:
+        self.nome = nome
+        self.aba = aba
+        self.memoria_inicial = memoria_inicial
+        self.pico = memoria_inicial
+        self.parede = time.perf_counter()
+        self.cpu = time.process_time()
+
+
+class MedidorEtapas:
+    """Acumula as medidas das etapas; com diretorio_cprofile, mantem um cProfile por etapa."""
+
+    def __init__(self, memoria: bool = True, diretorio_cprofile: Path | None = None) -> None:
+        self.memoria = memoria
+        self.diretorio_cprofile = diretorio_cprofile
+        self.medidas: List[MedidaEtapa] = []
+        self.inicio = time.perf_counter()
+        self.duracao: float | None = None
+        self._abertas: List[_Aberta] = []
+        self._perfis: Dict[str, cProfile.Profile] = {}
+        self._iniciou_tracemalloc = False
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+
+    def _memoria_atual(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.memoria else 0
+
+    def _pico_desde_reset(self) -> int:
+        return tracemalloc.get_traced_memory()[1] if self.memoria else 0
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str, aba: str | None = None) -> Iterator[None]:
+        # Etapa aninhada: guarda o pico da etapa de fora e pausa o cProfile dela (so um pode ficar ativo).
+        if self._abertas:
+            externa = self._abertas[-1]
+            externa.pico = max(externa.pico, self._pico_desde_reset())
+            if externa.nome in self._perfis:
+                self._perfis[externa.nome].disable()
+        if self.memoria:
+            tracemalloc.reset_peak()
+        aberta = _Aberta(nome, aba, self._memoria_atual())
+        self._abertas.append(aberta)
+        if self.diretorio_cprofile is not None:
+            self._perfis.setdefault(nome, cProfile.Profile()).enable()
+        try:
+            yield
+        finally:
+            if nome in self._perfis:
+                self._perfis[nome].disable()
+            parede = time.perf_counter() - aberta.parede
+            cpu = time.process_time() - aberta.cpu
+            aberta.pico = max(aberta.pico, self._pico_desde_reset())
+            self._abertas.pop()
+            pico = aberta.pico - aberta.memoria_inicial if self.memoria else None
+            self.medidas.append(MedidaEtapa(nome, aba, parede, cpu, pico))
+            if self._abertas:
+                externa = self._abertas[-1]
+                externa.pico = max(externa.pico, aberta.pico)
+                if externa.nome in self._perfis:
+                    self._perfis[externa.nome].enable()
+
+    def resumo(self) -> Dict[str, Dict[str, float | int | None]]:
+        """{etapa: chamadas, parede e cpu somados, maior pico de memoria}, na ordem de ETAPAS."""
+        nomes = [nome for nome in ETAPAS if any(medida.etapa == nome for medida in self.medidas)]
+        nomes += sorted({medida.etapa for medida in self.medidas} - set(nomes))
+        resumo: Dict[str, Dict[str, float | int | None]] = {}
+        for nome in nomes:
+            medidas = [medida for medida in self.medidas if medida.etapa == nome]
+            picos = [medida.pico_memoria for medida in medidas if medida.pico_memoria is not None]
+            resumo[nome] = {
+                "chamadas": len(medidas),
+                "parede_s": sum(medida.parede for medida in medidas),
+                "cpu_s": sum(medida.cpu for medida in medidas),
+                "pico_memoria_bytes": max(picos) if picos else None,
+            }
+        return resumo
+
+    def concluir(self) -> List[Path]:
+        """Encerra a medicao (tracemalloc) e grava os dumps do cProfile; devolve os .prof gravados."""
+        if self.duracao is None:
+            self.duracao = time.perf_counter() - self.inicio
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+        dumps: List[Path] = []
+        if self.diretorio_cprofile is not None and self._perfis:
+            self.diretorio_cprofile.mkdir(parents=True, exist_ok=True)
+            for nome, perfil in self._perfis.items():
+                destino = self.diretorio_cprofile / f"{nome}.prof"
+                perfil.dump_stats(destino)
+                dumps.append(destino)
+        return dumps
+
+    def imprimir(self) -> None:
+        resumo = self.resumo()
+        print("\nMedicao por etapa")
+        print("-----------------")
+        print(f"  {'etapa':<11} {'chamadas':>8} {'parede':>9} {'cpu':>9} {'pico mem.':>10}")
+        for nome, dados in resumo.items():
+            pico = dados["pico_memoria_bytes"]
+            pico_texto = f"{pico / 2**20:7.1f} MB" if pico is not None else "         -"
+            print(
+                f"  {nome:<11} {dados['chamadas']:>8d} {dados['parede_s']:>8.3f}s {dados['cpu_s']:>8.3f}s {pico_texto}"
+            )
+        total_etapas = sum(dados["parede_s"] for dados in resumo.values())
+        if self.duracao is not None:
+            print(f"  Total nas etapas: {total_etapas:.3f}s de {self.duracao:.3f}s de execucao")
+        if self.memoria:
+            print("  (tracemalloc ligado: os tempos ficam inflados; use --medir-sem-memoria para medir so tempo)")
+
+    def salvar_json(self, caminho: Path) -> None:
+        conteudo = {
+            "duracao_s": self.duracao,
+            "tracemalloc": self.memoria,
+            "etapas": self.resumo(),
+            "medidas": [medida._asdict() for medida in self.medidas],
+        }
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(json.dumps(conteudo, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+# Medidor ligado por medir_etapas; None = etapa() nao mede nada.
+_medidor_ativo: MedidorEtapas | None = None
+
+
+def etapa(nome: str, aba: str | None = None) -> ContextManager[None]:
+    """Marca um bloco do pipeline como etapa; so mede quando ha um medidor ativo."""
+    if _medidor_ativo is None:
+        return contextlib.nullcontext()
+    return _medidor_ativo.etapa(nome, aba)
+
+
+@contextlib.contextmanager
+def medir_etapas(
+    caminho_json: Path | None = None,
+    diretorio_cprofile: Path | None = None,
+    memoria: bool = True,
+) -> Iterator[MedidorEtapas]:
+    """
+    Liga a medicao para o bloco; ao sair (inclusive por erro ou Ctrl+C) imprime a tabela,
+    grava o JSON em caminho_json e os .prof por etapa em diretorio_cprofile.
+    """
+    global _medidor_ativo
+    medidor = MedidorEtapas(memoria, diretorio_cprofile)
+    anterior, _medidor_ativo = _medidor_ativo, medidor
+    try:
+        yield medidor
+    finally:
+        _medidor_ativo = anterior
+        dumps = medidor.concluir()
+        medidor.imprimir()
+        if caminho_json is not None:
+            medidor.salvar_json(caminho_json)
+            print(f"  Medidas salvas em {caminho_json}")
+        if dumps:
+            print(f"  cProfile por etapa em {diretorio_cprofile}/ (ex.: python -m pstats {dumps[0]})")
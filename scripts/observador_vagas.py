@@ -0,0 +1,69 @@
+"""
+Observacao do diretorio de dados por polling (sem dependencias extras).
+- A cada intervalo compara tamanho e mtime dos XLSX do diretorio
+- Um arquivo novo ou alterado so e entregue depois de ficar uma rodada inteira
+  sem mudar, para nao pegar um download ou copia ainda em andamento
+- Arquivos temporarios do Excel (~$...) e ocultos sao ignorados
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Tuple
+
+
+# Intervalo padrao entre duas verificacoes do diretorio, em segundos.
+INTERVALO_PADRAO = 2.0
+
+Assinatura = Tuple[int, int]
+
+
+def assinaturas_arquivos(diretorio: Path, padrao: str = "*.xlsx") -> Dict[Path, Assinatura]:
+    """{arquivo: (tamanho, mtime_ns)} dos arquivos do diretorio que casam com o padrao."""
+    assinaturas: Dict[Path, Assinatura] = {}
+    for caminho in diretorio.glob(padrao):
+        if caminho.name.startswith(("~$", ".")):
+            continue
+        try:
+            info = caminho.stat()
+        except FileNotFoundError:
+            continue
+        assinaturas[caminho] = (info.st_size, info.st_mtime_ns)
+    return assinaturas
+
+
+def observar_arquivos(
+    diretorio: Path,
+    intervalo: float = INTERVALO_PADRAO,
+    padrao: str = "*.xlsx",
+    iniciais: Mapping[Path, Assinatura] | None = None,
+) -> Iterator[Path]:
+    """
+    Gera, sem fim, os arquivos que chegaram ou mudaram no diretorio desde o inicio.
+    Os arquivos de iniciais (ou, sem ele, os presentes na primeira chamada de next) contam
+    como vistos. Quem processa algo antes de observar deve tirar a foto antes desse
+    processamento, senao um arquivo alterado durante ele nunca e entregue.
+    """
+    vistos = dict(iniciais) if iniciais is not None else assinaturas_arquivos(diretorio, padrao)
+    candidatos: Dict[Path, Assinatura] = {}
+    while True:
+        time.sleep(intervalo)
+        atuais = assinaturas_arquivos(diretorio, padrao)
+        for caminho in list(vistos):
+            if caminho not in atuais:
+                del vistos[caminho]
+        for caminho in list(candidatos):
+            if caminho not in atuais:
+                del candidatos[caminho]
+
+        for caminho, assinatura in atuais.items():
+            if vistos.get(caminho) == assinatura:
+                candidatos.pop(caminho, None)
+            elif candidatos.get(caminho) == assinatura:
+                # Mesma assinatura por uma rodada inteira: escrita concluida.
+                del candidatos[caminho]
+                vistos[caminho] = assinatura
+                yield caminho
+            else:
+                candidatos[caminho] = assinatura
@@ -0,0 +1,338 @@
+"""
+Servidor HTTP local com as tabelas arrumadas e os graficos do XLSX (gerar_grafico_vagas.py --servir).
+- Cada aba e lida uma vez (carregar_tabela_vagas) e fica em memoria; se o XLSX mudar,
+  tabelas e respostas sao descartadas e relidas sob demanda
+- Respostas (JSON, CSV e graficos) ficam em um cache LRU em memoria, chaveado pela rota e
+  pelos parametros, com ETag: If-None-Match igual devolve 304 sem corpo
+- Graficos saem de plotar_taxa_vagas, com uma figura reaproveitada por perfil
+
+Rotas (GET):
+  /abas                       lista [{numero, aba, area}]
+  /abas/<aba>.json            tabela arrumada em JSON
+  /abas/<aba>.csv             tabela arrumada em CSV (mesmo formato do PowerBI/)
+  /abas/<aba>.png|svg|pdf     grafico (?perfil=previa|publicacao escolhe o PNG)
+<aba> aceita o nome ("Sheet 19"), o numero do menu ou o slug ("sheet_19").
+Filtros: ?geo=Spain&geo=France (repetivel), ?de=2023-Q1 e ?ate=2024-Q4 (inclusivos).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from gerar_grafico_vagas import (
+    PAISES_PADRAO,
+    carregar_tabela_vagas,
+    listar_abas_excel,
+    plotar_taxa_vagas,
+    resolver_abas,
+    slugificar,
+)
+from graficos_vagas import PERFIL_PADRAO, PERFIS_RENDER, RenderizadorGrafico
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+# Respostas guardadas no cache em memoria (as menos usadas saem primeiro).
+MAX_RESPOSTAS = 256
+
+TIPOS_CONTEUDO = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+
+class ErroRequisicao(Exception):
+    """Erro do cliente (aba, geo ou trimestre invalidos) com o status HTTP a devolver."""
+
+    def __init__(self, status: int, mensagem: str) -> None:
+        super().__init__(mensagem)
+        self.status = status
+
+
+class Resposta(NamedTuple):
+    tipo: str
+    corpo: bytes
+    etag: str
+
+
+def _resposta(extensao: str, corpo: bytes) -> Resposta:
+    return Resposta(TIPOS_CONTEUDO[extensao], corpo, f'"{hashlib.sha256(corpo).hexdigest()[:32]}"')
+
+
+def _json(conteudo: object) -> Resposta:
+    return _resposta("json", json.dumps(conteudo, ensure_ascii=False).encode("utf-8"))
+
+
+class EstadoServidor:
+    """Tabelas, respostas e renderizadores mantidos em memoria entre as requisicoes."""
+
+    def __init__(
+        self,
+        caminho_excel: Path,
+        diretorio_cache: Path | None = None,
+        paises: Sequence[str] = PAISES_PADRAO,
+        perfil: str = PERFIL_PADRAO,
+        linha_cabecalho: int = 10,
+        linha_inicio_dados: int = 12,
+        max_respostas: int = MAX_RESPOSTAS,
+    ) -> None:
+        self.caminho_excel = caminho_excel
+        self.diretorio_cache = diretorio_cache
+        self.paises = list(paises)
+        self.perfil = perfil
+        self.linha_cabecalho = linha_cabecalho
+        self.linha_inicio_dados = linha_inicio_dados
+        self.max_respostas = max_respostas
+        # Uma trava para tabelas/cache e outra para o matplotlib, que nao e thread-safe.
+        self._trava = threading.Lock()
+        self._trava_grafico = threading.Lock()
+        self._assinatura: Tuple[int, int] | None = None
+        self._abas: List[Tuple[str, str | None]] = []
+        self._tabelas: Dict[str, Tuple[pd.DataFrame, List[str]]] = {}
+        self._respostas: OrderedDict[Tuple, Resposta] = OrderedDict()
+        self._renderizadores: Dict[str, RenderizadorGrafico] = {}
+        self._temporario = tempfile.TemporaryDirectory(prefix="vagas-graficos-")
+
+    def _sincronizar(self) -> None:
+        """Descarta tabelas e respostas quando o XLSX muda (tamanho ou mtime)."""
+        try:
+            info = self.caminho_excel.stat()
+        except FileNotFoundError:
+            raise ErroRequisicao(503, f"Arquivo nao encontrado: {self.caminho_excel}") from None
+        assinatura = (info.st_size, info.st_mtime_ns)
+        if assinatura != self._assinatura:
+            self._abas = listar_abas_excel(self.caminho_excel)
+            self._tabelas.clear()
+            self._respostas.clear()
+            self._assinatura = assinatura
+
+    def responder(self, rota: str, parametros: Dict[str, List[str]]) -> Resposta:
+        """Resposta da rota, do cache quando possivel."""
+        with self._trava:
+            self._sincronizar()
+            filtros = tuple(sorted((nome, tuple(valores)) for nome, valores in parametros.items()))
+            chave = (self._assinatura, rota, filtros)
+            resposta = self._respostas.get(chave)
+            if resposta is not None:
+                self._respostas.move_to_end(chave)
+                return resposta
+
+        resposta = self._gerar(rota, parametros)
+        with self._trava:
+            self._respostas[chave] = resposta
+            while len(self._respostas) > self.max_respostas:
+                self._respostas.popitem(last=False)
+        return resposta
+
+    def _gerar(self, rota: str, parametros: Dict[str, List[str]]) -> Resposta:
+        partes = [parte for parte in rota.split("/") if parte]
+        if partes in ([], ["abas"]):
+            return _json(
+                [{"numero": idx, "aba": aba, "area": area} for idx, (aba, area) in enumerate(self._abas, start=1)]
+            )
+        if len(partes) != 2 or partes[0] != "abas" or "." not in partes[1]:
+            raise ErroRequisicao(404, f"Rota desconhecida: {rota}")
+
+        seletor, extensao = partes[1].rsplit(".", 1)
+        if extensao not in TIPOS_CONTEUDO:
+            raise ErroRequisicao(404, f"Formato desconhecido: .{extensao} (use {', '.join(TIPOS_CONTEUDO)})")
+        nome_aba = self._resolver_aba(seletor)
+        dados, ordem = self._tabela(nome_aba)
+        recorte, trimestres, geos = _filtrar(dados, ordem, parametros)
+
+        if extensao == "json":
+            return _json(
+                {
+                    "aba": nome_aba,
+                    "trimestres": trimestres,
+                    "dados": recorte.assign(trimestre=recorte["trimestre"].astype(str)).to_dict(orient="records"),
+                }
+            )
+        if extensao == "csv":
+            return _resposta("csv", recorte.to_csv(index=False).encode("utf-8"))
+        return self._grafico(nome_aba, recorte, trimestres, geos or self._geos_padrao(dados), extensao, parametros)
+
+    def _resolver_aba(self, seletor: str) -> str:
+        nomes = [aba for aba, _ in self._abas]
+        por_slug = {slugificar(nome): nome for nome in nomes}
+        if seletor in por_slug:
+            return por_slug[seletor]
+        try:
+            escolhidas = resolver_abas([seletor], nomes)
+        except SystemExit as exc:
+            raise ErroRequisicao(404, str(exc)) from None
+        if len(escolhidas) != 1:
+            raise ErroRequisicao(400, f"O seletor {seletor} casa com {len(escolhidas)} abas; informe uma so.")
+        return escolhidas[0]
+
+    def _tabela(self, nome_aba: str) -> Tuple[pd.DataFrame, List[str]]:
+        with self._trava:
+            if nome_aba not in self._tabelas:
+                dados, ordem, _ = carregar_tabela_vagas(
+                    self.caminho_excel,
+                    nome_aba,
+                    self.linha_cabecalho,
+                    self.linha_inicio_dados,
+                    diretorio_cache=self.diretorio_cache,
+                )
+                self._tabelas[nome_aba] = (dados, ordem)
+            return self._tabelas[nome_aba]
+
+    def _geos_padrao(self, dados: pd.DataFrame) -> List[str]:
+        disponiveis = set(dados["geo"].unique())
+        geos = [geo for geo in self.paises if geo in disponiveis]
+        if not geos:
+            raise ErroRequisicao(400, "Nenhum dos geos padrao existe nesta aba; informe ?geo=...")
+        return geos
+
+    def _grafico(
+        self,
+        nome_aba: str,
+        recorte: pd.DataFrame,
+        trimestres: List[str],
+        geos: List[str],
+        formato: str,
+        parametros: Dict[str, List[str]],
+    ) -> Resposta:
+        perfis = [nome for nome, dados_perfil in PERFIS_RENDER.items() if dados_perfil.formato == formato]
+        perfil = parametros.get("perfil", [self.perfil if self.perfil in perfis else perfis[0]])[-1]
+        if perfil not in perfis:
+            raise ErroRequisicao(400, f"Perfil {perfil} nao gera .{formato} (use {', '.join(perfis)})")
+
+        chave = json.dumps([nome_aba, geos, trimestres, perfil])
+        arquivo = Path(self._temporario.name) / f"{hashlib.sha1(chave.encode('utf-8')).hexdigest()}.{formato}"
+        with self._trava_grafico:
+            if perfil not in self._renderizadores:
+                self._renderizadores[perfil] = RenderizadorGrafico(perfil)
+            try:
+                # Se o arquivo ja tem a mesma impressao das entradas, plotar_taxa_vagas nem redesenha.
+                plotar_taxa_vagas(recorte, trimestres, geos, nome_aba, arquivo, self._renderizadores[perfil])
+            except ValueError as exc:
+                raise ErroRequisicao(400, str(exc)) from None
+            return _resposta(formato, arquivo.read_bytes())
+
+    def fechar(self) -> None:
+        for renderizador in self._renderizadores.values():
+            renderizador.fechar()
+        self._temporario.cleanup()
+
+
+def _filtrar(
+    dados: pd.DataFrame, ordem: List[str], parametros: Dict[str, List[str]]
+) -> Tuple[pd.DataFrame, List[str], List[str]]:
+    """Aplica ?geo, ?de e ?ate; devolve o recorte, os trimestres do intervalo e os geos pedidos."""
+    geos = parametros.get("geo", [])
+    disponiveis = set(dados["geo"].unique())
+    desconhecidos = [geo for geo in geos if geo not in disponiveis]
+    if desconhecidos:
+        raise ErroRequisicao(400, f"Geos nao encontrados na aba: {', '.join(desconhecidos)}")
+
+    de = parametros.get("de", [None])[-1]
+    ate = parametros.get("ate", [None])[-1]
+    for rotulo in (de, ate):
+        if rotulo is not None and rotulo not in ordem:
+            intervalo = f"de {ordem[0]} a {ordem[-1]}" if ordem else "a aba nao tem trimestres"
+            raise ErroRequisicao(400, f"Trimestre fora da aba: {rotulo} ({intervalo})")
+    inicio = ordem.index(de) if de is not None else 0
+    fim = ordem.index(ate) + 1 if ate is not None else len(ordem)
+    if de is not None and ate is not None and inicio >= fim:
+        raise ErroRequisicao(400, f"Intervalo invertido: de={de} depois de ate={ate}")
+    trimestres = ordem[inicio:fim]
+
+    mascara = dados["trimestre"].astype(str).isin(trimestres)
+    if geos:
+        mascara &= dados["geo"].isin(geos)
+    return dados[mascara], trimestres, geos
+
+
+# Entity-tags de um If-None-Match: "*" ou lista de "opaco" / W/"opaco" separados por virgula.
+_ENTITY_TAG = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+def _etag_confere(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match segundo a RFC 9110: "*" ou qualquer tag da lista, com comparacao fraca (W/ ignorado)."""
+    if not if_none_match:
+        return False
+    tags = _ENTITY_TAG.findall(if_none_match)
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+
+def _criar_manipulador(estado: EstadoServidor) -> type:
+    class ManipuladorVagas(BaseHTTPRequestHandler):
+        server_version = "VagasHTTP/1.0"
+
+        def do_GET(self) -> None:
+            self._atender(com_corpo=True)
+
+        def do_HEAD(self) -> None:
+            # Mesmos status e cabecalhos do GET, sem o corpo.
+            self._atender(com_corpo=False)
+
+        def _atender(self, com_corpo: bool) -> None:
+            url = urlsplit(self.path)
+            try:
+                resposta = estado.responder(unquote(url.path), parse_qs(url.query))
+            except ErroRequisicao as exc:
+                self._enviar(exc.status, _json({"erro": str(exc)}), com_corpo)
+                return
+            except Exception as exc:
+                self._enviar(500, _json({"erro": f"{type(exc).__name__}: {exc}"}), com_corpo)
+                return
+
+            if _etag_confere(self.headers.get("If-None-Match"), resposta.etag):
+                self._enviar(304, resposta, com_corpo=False, com_tipo=False)
+            else:
+                self._enviar(200, resposta, com_corpo)
+
+        def _enviar(self, status: int, resposta: Resposta, com_corpo: bool = True, com_tipo: bool = True) -> None:
+            self.send_response(status)
+            if status < 400:
+                self.send_header("ETag", resposta.etag)
+                # no-cache: o cliente guarda, mas sempre revalida com o ETag.
+                self.send_header("Cache-Control", "no-cache")
+            if com_tipo:
+                self.send_header("Content-Type", resposta.tipo)
+                self.send_header("Content-Length", str(len(resposta.corpo)))
+            self.end_headers()
+            if com_corpo:
+                self.wfile.write(resposta.corpo)
+
+    return ManipuladorVagas
+
+
+def servir(
+    caminho_excel: Path,
+    host: str = HOST_PADRAO,
+    porta: int = PORTA_PADRAO,
+    diretorio_cache: Path | None = None,
+    paises: Sequence[str] = PAISES_PADRAO,
+    perfil: str = PERFIL_PADRAO,
+    linha_cabecalho: int = 10,
+    linha_inicio_dados: int = 12,
+) -> None:
+    """Sobe o servidor e atende ate Ctrl+C."""
+    estado = EstadoServidor(caminho_excel, diretorio_cache, paises, perfil, linha_cabecalho, linha_inicio_dados)
+    try:
+        with ThreadingHTTPServer((host, porta), _criar_manipulador(estado)) as servidor:
+            print(f"Servindo {caminho_excel} em http://{host}:{porta}/abas (Ctrl+C para sair)")
+            try:
+                servidor.serve_forever()
+            except KeyboardInterrupt:
+                print("\nServidor encerrado.")
+    finally:
+        estado.fechar()
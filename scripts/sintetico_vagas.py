@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Gerador de XLSX sintetico no layout da Eurostat, para medir o pipeline em escala.
+- Mesma estrutura das abas reais: metadados nas linhas 1-9 com a area em C7, cabecalho TIME
+  na linha 11 (indice 10) com pares valor/flag por trimestre, GEO (Labels) na linha 12 e
+  dados a partir da linha 13 (indice 12), ":" nas lacunas e a legenda de flags no rodape
+- Todas as celulas sao inlineStr (inclusive os numeros), como no arquivo baixado; a primeira
+  aba e um Summary sem dados
+- Deterministico: mesma semente e mesmo tamanho geram os mesmos bytes (datas fixas no zip)
+
+Uso: python scripts/sintetico_vagas.py saida.xlsx --tamanho 200x40x40   (abas x geos x trimestres)
+"""
+
+from __future__ import annotations
+
+import argparse
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from gerar_grafico_vagas import PAISES_PADRAO
+
+
+# Ultimo trimestre das abas geradas (os demais vem antes, em ordem).
+ULTIMO_TRIMESTRE = "2025-Q3"
+# Fracao padrao de celulas ":" (sem dado).
+FRACAO_LACUNAS = 0.1
+# Geos alem dos padroes do grafico; acima disso viram "Regiao sintetica N".
+GEOS_EXTRAS = [
+    "Belgium", "Bulgaria", "Czechia", "Denmark", "Estonia", "Ireland", "Greece", "Croatia", "Italy", "Cyprus",
+    "Latvia", "Lithuania", "Luxembourg", "Hungary", "Malta", "Netherlands", "Austria", "Poland", "Portugal",
+    "Romania", "Slovenia", "Slovakia", "Finland", "Sweden", "Iceland", "Norway", "Switzerland",
+    "North Macedonia", "Serbia", "Turkey",
+]
+FLAGS = ("p", "b")
+
+_NS = (
+    'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+_TIPO_PLANILHA = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+_REL_DOC = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+class TamanhoSintetico(NamedTuple):
+    """Abas de dados (fora o Summary), geos por aba e trimestres por aba."""
+
+    abas: int
+    geos: int
+    trimestres: int
+
+    def rotulo(self) -> str:
+        return f"{self.abas}x{self.geos}x{self.trimestres}"
+
+
+def ler_tamanho(texto: str) -> TamanhoSintetico:
+    """Converte 'ABASxGEOSxTRIMESTRES' (ex.: 200x40x40) em TamanhoSintetico; uso como type do argparse."""
+    try:
+        tamanho = TamanhoSintetico(*(int(parte) for parte in texto.lower().split("x")))
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(f"Tamanho invalido: {texto} (use ABASxGEOSxTRIMESTRES, ex.: 50x40x20)")
+    if min(tamanho) < 1:
+        raise argparse.ArgumentTypeError(f"Tamanho invalido: {texto} (todos os numeros devem ser >= 1)")
+    return tamanho
+
+
+def rotulos_trimestres(quantidade: int, ultimo: str = ULTIMO_TRIMESTRE) -> List[str]:
+    """Os `quantidade` trimestres que terminam em `ultimo`, em ordem crescente."""
+    ano, trimestre = int(ultimo[:4]), int(ultimo[-1])
+    ordinal_final = ano * 4 + trimestre - 1
+    return [
+        f"{ordinal // 4}-Q{ordinal % 4 + 1}" for ordinal in range(ordinal_final - quantidade + 1, ordinal_final + 1)
+    ]
+
+
+def nomes_geos(quantidade: int) -> List[str]:
+    """Geos padrao do grafico primeiro (para toda aba ter grafico), depois paises e regioes sinteticas."""
+    nomes = [*PAISES_PADRAO, *(geo for geo in GEOS_EXTRAS if geo not in PAISES_PADRAO)]
+    nomes += [f"Regiao sintetica {idx}" for idx in range(1, quantidade - len(nomes) + 1)]
+    return nomes[:quantidade]
+
+
+def letra_coluna(indice: int) -> str:
+    """Inverso de leitor_xlsx.indice_coluna: 0 -> A, 26 -> AA."""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+def _celula(coluna: int, linha: int, texto: str) -> str:
+    return f'<c r="{letra_coluna(coluna)}{linha}" t="inlineStr"><is><t>{escape(texto)}</t></is></c>'
+
+
+def _linha(numero: int, textos: Sequence[Tuple[int, str]]) -> str:
+    """Linha XML com as celulas (coluna, texto); sem celulas, a linha sai vazia como no arquivo real."""
+    return f'<row r="{numero}">' + "".join(_celula(coluna, numero, texto) for coluna, texto in textos) + "</row>\n"
+
+
+def _xml_aba_dados(
+    area: str,
+    trimestres: Sequence[str],
+    geos: Sequence[str],
+    gerador: np.random.Generator,
+    fracao_lacunas: float,
+) -> Iterator[str]:
+    """Partes do XML de uma aba de dados, linha a linha (memoria constante mesmo com abas grandes)."""
+    n_colunas = 1 + 2 * len(trimestres)
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<worksheet {_NS}><sheetData>\n'
+    yield _linha(1, [(0, "Data extracted on 20/11/2025 01:54:12 from [ESTAT]")])
+    yield _linha(2, [(0, "Dataset: "), (1, "Job vacancy rate - quarterly data [sintetico]")])
+    yield _linha(3, [(0, "Last updated: "), (1, "19/11/2025 11:00")])
+    yield _linha(4, [])
+    yield _linha(5, [(0, "Time frequency"), (2, "Quarterly")])
+    yield _linha(6, [(0, "Seasonal adjustment"), (2, "Unadjusted data")])
+    yield _linha(7, [(0, "Statistical classification of economic activities (NACE Rev. 2)"), (2, area)])
+    yield _linha(8, [(0, "Size classes in number of employees"), (2, "10 employees or more")])
+    yield _linha(9, [(0, "Indicator"), (2, "Job vacancy rate")])
+    yield _linha(10, [])
+    # Cabecalho: rotulo do trimestre na coluna de valor e vazio na coluna de flag ao lado.
+    cabecalho = [(coluna, trimestres[(coluna - 1) // 2] if coluna % 2 else "") for coluna in range(1, n_colunas)]
+    yield _linha(11, [(0, "TIME"), *cabecalho])
+    yield _linha(12, [(0, "GEO (Labels)")] + [(coluna, "") for coluna in range(1, n_colunas)])
+
+    # Taxa base por geo + ruido por trimestre; algumas linhas inteiras sem dado, como os agregados antigos.
+    base = gerador.uniform(0.5, 4.5, size=len(geos))
+    valores = np.round(np.clip(base[:, None] + gerador.normal(0, 0.4, (len(geos), len(trimestres))), 0.1, None), 1)
+    lacunas = gerador.random((len(geos), len(trimestres))) < fracao_lacunas
+    lacunas[gerador.random(len(geos)) < fracao_lacunas / 2] = True
+    flags = gerador.random((len(geos), len(trimestres)))
+    for idx, geo in enumerate(geos):
+        textos = [(0, geo)]
+        for posicao in range(len(trimestres)):
+            if lacunas[idx, posicao]:
+                valor, flag = ":", ""
+            else:
+                valor = f"{valores[idx, posicao]:.1f}"
+                flag = FLAGS[0] if flags[idx, posicao] < 0.1 else FLAGS[1] if flags[idx, posicao] < 0.12 else ""
+            textos += [(1 + 2 * posicao, valor), (2 + 2 * posicao, flag)]
+        yield _linha(13 + idx, textos)
+
+    rodape = 13 + len(geos) + 1
+    legenda = [("Special value", None), (":", "not available"), ("Observation flags:", None)]
+    legenda += [("b", "break in time series"), ("p", "provisional")]
+    for deslocamento, (chave, descricao) in enumerate(legenda):
+        yield _linha(rodape + deslocamento, [(0, chave)] + ([(1, descricao)] if descricao else []))
+    yield "</sheetData><mergeCells>"
+    yield "".join(
+        f'<mergeCell ref="{letra_coluna(coluna)}11:{letra_coluna(coluna + 1)}11"/>' for coluna in range(1, n_colunas, 2)
+    )
+    yield "</mergeCells></worksheet>"
+
+
+def _xml_summary(nomes_abas: Sequence[str], areas: Sequence[str]) -> str:
+    linhas = [_linha(1, [(0, "Job vacancy rate - quarterly data [sintetico]")]), _linha(2, [])]
+    linhas += [_linha(3 + idx, [(0, nome), (2, area)]) for idx, (nome, area) in enumerate(zip(nomes_abas, areas))]
+    conteudo = "".join(linhas)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<worksheet {_NS}><sheetData>\n{conteudo}</sheetData></worksheet>'
+
+
+def _escrever(arquivo_zip: zipfile.ZipFile, nome: str, partes: Iterator[str] | str) -> None:
+    # Data fixa: o mesmo conteudo gera o mesmo zip.
+    info = zipfile.ZipInfo(nome, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with arquivo_zip.open(info, "w") as destino:
+        for parte in [partes] if isinstance(partes, str) else partes:
+            destino.write(parte.encode("utf-8"))
+
+
+def gerar_xlsx_sintetico(
+    caminho: Path,
+    tamanho: TamanhoSintetico,
+    semente: int = 0,
+    fracao_lacunas: float = FRACAO_LACUNAS,
+) -> Path:
+    """Grava um XLSX com um Summary e `tamanho.abas` abas de dados no layout da Eurostat."""
+    gerador = np.random.default_rng(semente)
+    trimestres = rotulos_trimestres(tamanho.trimestres)
+    geos = nomes_geos(tamanho.geos)
+    nomes_abas = ["Summary", *(f"Sheet {idx}" for idx in range(1, tamanho.abas + 1))]
+    areas = [f"Setor sintetico {idx}" for idx in range(1, tamanho.abas + 1)]
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(f".{caminho.name}.tmp")
+    with zipfile.ZipFile(temporario, "w") as arquivo_zip:
+        partes_abas = [f"/xl/worksheets/sheet{idx}.xml" for idx in range(1, len(nomes_abas) + 1)]
+        _escrever(
+            arquivo_zip,
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{_TIPO_PLANILHA}.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="{parte}" ContentType="{_TIPO_PLANILHA}.worksheet+xml"/>' for parte in partes_abas
+            )
+            + "</Types>",
+        )
+        _escrever(
+            arquivo_zip,
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{_REL_DOC}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>",
+        )
+        _escrever(
+            arquivo_zip,
+            "xl/workbook.xml",
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<workbook {_NS}><sheets>'
+            + "".join(
+                f'<sheet name="{escape(nome)}" sheetId="{idx}" r:id="rId{idx}"/>'
+                for idx, nome in enumerate(nomes_abas, start=1)
+            )
+            + "</sheets></workbook>",
+        )
+        _escrever(
+            arquivo_zip,
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{idx}" Type="{_REL_DOC}/worksheet" Target="worksheets/sheet{idx}.xml"/>'
+                for idx in range(1, len(nomes_abas) + 1)
+            )
+            + "</Relationships>",
+        )
+        _escrever(arquivo_zip, "xl/worksheets/sheet1.xml", _xml_summary(nomes_abas[1:], areas))
+        for idx, area in enumerate(areas, start=2):
+            _escrever(
+                arquivo_zip,
+                f"xl/worksheets/sheet{idx}.xml",
+                _xml_aba_dados(area, trimestres, geos, gerador, fracao_lacunas),
+            )
+    temporario.replace(caminho)
+    return caminho
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera um XLSX sintetico no layout da Eurostat.")
+    parser.add_argument("saida", type=Path, help="Arquivo .xlsx de saida.")
+    parser.add_argument(
+        "--tamanho", type=ler_tamanho, default=ler_tamanho("64x40x10"), help="ABASxGEOSxTRIMESTRES (padrao: 64x40x10)."
+    )
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos valores aleatorios (padrao: 0).")
+    parser.add_argument(
+        "--lacunas", type=float, default=FRACAO_LACUNAS, help=f'Fracao de celulas ":" (padrao: {FRACAO_LACUNAS}).'
+    )
+    args = parser.parse_args()
+    caminho = gerar_xlsx_sintetico(args.saida, args.tamanho, args.semente, args.lacunas)
+    print(f"{caminho}: {args.tamanho.rotulo()} ({caminho.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cache de abas em .npz e manifesto: invalidacao por caminho do XLSX e limite de tamanho."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from cache_vagas import (  # noqa: E402
+    carregar_manifesto,
+    carregar_matriz_cache,
+    limitar_cache,
+    salvar_manifesto,
+    salvar_matriz_cache,
+)
+from leitor_xlsx import abrir_livro  # noqa: E402
+from sintetico_vagas import TamanhoSintetico, gerar_xlsx_sintetico  # noqa: E402
+
+TAMANHO = TamanhoSintetico(1, 5, 4)
+
+
+def _gravar(caminho: Path, semente: int) -> Path:
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    return gerar_xlsx_sintetico(caminho, TAMANHO, semente=semente)
+
+
+class CacheVagasTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.raiz = Path(self._tmp.name)
+        self.cache = self.raiz / "cache"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _salvar(self, caminho: Path) -> Path:
+        matriz = abrir_livro(caminho).ler_aba("Sheet 1")
+        return salvar_matriz_cache(self.cache, caminho, "Sheet 1", matriz)
+
+    def test_homonimo_em_outra_pasta_nao_invalida(self) -> None:
+        primeiro = _gravar(self.raiz / "a" / "job_vacancies.xlsx", semente=1)
+        segundo = _gravar(self.raiz / "b" / "job_vacancies.xlsx", semente=2)
+        self._salvar(primeiro)
+        self._salvar(segundo)
+        self.assertIsNotNone(carregar_matriz_cache(self.cache, primeiro, "Sheet 1"))
+        self.assertIsNotNone(carregar_matriz_cache(self.cache, segundo, "Sheet 1"))
+
+    def test_nova_versao_do_mesmo_caminho_invalida(self) -> None:
+        caminho = _gravar(self.raiz / "a" / "job_vacancies.xlsx", semente=1)
+        antiga = self._salvar(caminho)
+        _gravar(caminho, semente=3)
+        self._salvar(caminho)
+        self.assertFalse(antiga.exists())
+
+    def test_entrada_removida_durante_a_carga(self) -> None:
+        caminho = _gravar(self.raiz / "a" / "job_vacancies.xlsx", semente=1)
+        self._salvar(caminho)
+        # Outro processo remove a entrada (limitar_cache) entre a leitura e o utime.
+        with mock.patch("cache_vagas.os.utime", side_effect=FileNotFoundError):
+            matriz = carregar_matriz_cache(self.cache, caminho, "Sheet 1")
+        self.assertIsNotNone(matriz)
+
+    def test_manifesto_de_homonimo_em_outra_pasta(self) -> None:
+        primeiro = _gravar(self.raiz / "a" / "job_vacancies.xlsx", semente=1)
+        segundo = _gravar(self.raiz / "b" / "job_vacancies.xlsx", semente=2)
+        salvar_manifesto(self.cache, primeiro, {"Sheet 1": {"impressao": "a"}})
+        salvar_manifesto(self.cache, segundo, {"Sheet 1": {"impressao": "b"}})
+        self.assertEqual(carregar_manifesto(self.cache, primeiro), {"Sheet 1": {"impressao": "a"}})
+        self.assertEqual(carregar_manifesto(self.cache, segundo), {"Sheet 1": {"impressao": "b"}})
+
+    def test_limite_ignora_temporarios(self) -> None:
+        self.cache.mkdir()
+        temporario = self.cache / "job_vacancies-0-1-2.123.tmp.npz"
+        temporario.write_bytes(b"x" * 1024)
+        self.assertEqual(limitar_cache(self.cache, limite_bytes=0), 0)
+        self.assertTrue(temporario.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
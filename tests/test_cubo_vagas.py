@@ -0,0 +1,78 @@
+"""Cubo setor x geo x trimestre no layout real da Eurostat (rodape com a legenda abaixo dos dados)."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+import numpy as np  # noqa: E402
+
+from cubo_vagas import CuboVagas, abrir_cubo, salvar_cubo  # noqa: E402
+from leitor_xlsx import abrir_livro, listar_nomes_abas  # noqa: E402
+from sintetico_vagas import TamanhoSintetico, gerar_xlsx_sintetico  # noqa: E402
+
+ARQUIVO_REAL = RAIZ / "data" / "job_vacancies.xlsx"
+RODAPE = {"Special value", ":", "Observation flags:", "Confidentiality flags:", "b", "e", "p", "u", "C", "d"}
+
+
+def _cubo(caminho: Path) -> CuboVagas:
+    livro = abrir_livro(caminho)
+    return CuboVagas.de_matrizes({nome: livro.ler_aba(nome) for nome in listar_nomes_abas(caminho)})
+
+
+class CuboLayoutRealTest(unittest.TestCase):
+    def test_geos_sem_rodape(self) -> None:
+        cubo = _cubo(ARQUIVO_REAL)
+        self.assertEqual(cubo.formato, (60, 37, 10))
+        self.assertFalse(RODAPE & set(cubo.geos))
+        self.assertEqual(cubo.geos[-1], "Türkiye")
+        # Geo real sem nenhum valor continua no cubo.
+        self.assertIn("United Kingdom", cubo.geos)
+
+    def test_sintetico_sem_rodape(self) -> None:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = gerar_xlsx_sintetico(Path(diretorio) / "sintetico.xlsx", TamanhoSintetico(3, 12, 6))
+            cubo = _cubo(caminho)
+        self.assertEqual(cubo.formato, (3, 12, 6))
+        self.assertFalse(RODAPE & set(cubo.geos))
+
+
+class CuboPersistidoTest(unittest.TestCase):
+    def test_salvar_e_abrir(self) -> None:
+        cubo = _cubo(ARQUIVO_REAL)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = salvar_cubo(cubo, Path(diretorio) / "cubo.npy")
+            aberto = abrir_cubo(caminho)
+            self.assertEqual(aberto.geos, cubo.geos)
+            np.testing.assert_array_equal(aberto.valores, cubo.valores)
+            del aberto
+
+    def test_copia_sem_metadados(self) -> None:
+        # cp/rsync sem -t/checkout: mtime novo, mesmo conteudo.
+        cubo = _cubo(ARQUIVO_REAL)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = salvar_cubo(cubo, Path(diretorio) / "cubo.npy")
+            copia = Path(diretorio) / "copia" / "cubo.npy"
+            copia.parent.mkdir()
+            shutil.copyfile(caminho, copia)
+            shutil.copyfile(caminho.with_suffix(".json"), copia.with_suffix(".json"))
+            aberto = abrir_cubo(copia)
+            self.assertEqual(aberto.formato, cubo.formato)
+            del aberto
+
+    def test_queda_entre_os_renames(self) -> None:
+        # Simula uma queda depois de trocar o .npy e antes do indice: mesmo formato, outro conteudo.
+        cubo = _cubo(ARQUIVO_REAL)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = salvar_cubo(cubo, Path(diretorio) / "cubo.npy")
+            np.save(caminho, np.zeros(cubo.formato, dtype=np.float32))
+            with self.assertRaises(ValueError):
+                abrir_cubo(caminho)
+
+
+if __name__ == "__main__":
+    unittest.main()
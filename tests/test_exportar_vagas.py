@@ -0,0 +1,88 @@
+"""Esquema estrela montado a partir do XLSX real da Eurostat."""
+
+import contextlib
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from exportar_vagas import gravar_se_mudou, montar_esquema_estrela, salvar_sqlite  # noqa: E402
+from leitor_xlsx import abrir_livro, listar_nomes_abas  # noqa: E402
+
+ARQUIVO_REAL = RAIZ / "data" / "job_vacancies.xlsx"
+
+
+class EsquemaEstrelaTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        livro = abrir_livro(ARQUIVO_REAL)
+        cls.matrizes = {nome: livro.ler_aba(nome, com_flags=True) for nome in listar_nomes_abas(ARQUIVO_REAL)}
+        cls.tabelas = montar_esquema_estrela(cls.matrizes)
+
+    def test_dim_geo_so_com_geos_do_fato(self) -> None:
+        fato, dim_geo = self.tabelas["fato_vagas"], self.tabelas["dim_geo"]
+        self.assertEqual(set(fato["id_geo"]), set(dim_geo["id_geo"]))
+        self.assertEqual(list(dim_geo["id_geo"]), list(range(1, len(dim_geo) + 1)))
+        self.assertNotIn("Special value", set(dim_geo["geo"]))
+        self.assertNotIn("Observation flags:", set(dim_geo["geo"]))
+
+    def test_sqlite_ida_e_volta_pela_view(self) -> None:
+        esperadas = set()
+        for nome_aba, matriz in self.matrizes.items():
+            if not np.isfinite(matriz.valores).any():
+                continue
+            for linha, geo in enumerate(matriz.geos):
+                for coluna, trimestre in enumerate(matriz.trimestres):
+                    valor, flag = matriz.valores[linha, coluna], matriz.flags[linha, coluna]
+                    if math.isfinite(valor) or flag is not None:
+                        esperadas.add(
+                            (nome_aba, matriz.area, geo, trimestre, valor if math.isfinite(valor) else None, flag)
+                        )
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = salvar_sqlite(self.tabelas, Path(diretorio) / "vagas.sqlite")
+            with contextlib.closing(sqlite3.connect(caminho)) as conexao:
+                linhas = conexao.execute("SELECT aba, area, geo, trimestre, taxa_vaga, flag FROM vagas").fetchall()
+            self.assertEqual(len(linhas), len(esperadas))
+            self.assertEqual(set(linhas), esperadas)
+
+            # Mesmo conteudo: o banco atual fica (mtime preservado).
+            os.utime(caminho, ns=(1_000_000_000, 1_000_000_000))
+            salvar_sqlite(self.tabelas, caminho)
+            self.assertEqual(caminho.stat().st_mtime_ns, 1_000_000_000)
+            self.assertEqual([arquivo.name for arquivo in Path(diretorio).iterdir()], ["vagas.sqlite"])
+
+    def test_sqlite_com_erro_nao_deixa_temporario(self) -> None:
+        quebradas = dict(self.tabelas, dim_geo=self.tabelas["dim_geo"].assign(coluna_inexistente=1))
+        with tempfile.TemporaryDirectory() as diretorio:
+            with self.assertRaises(sqlite3.OperationalError):
+                salvar_sqlite(quebradas, Path(diretorio) / "vagas.sqlite")
+            self.assertEqual(list(Path(diretorio).iterdir()), [])
+
+
+class GravarSeMudouTest(unittest.TestCase):
+    def test_conteudo_igual_preserva_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / "sub" / "tabela.csv"
+            self.assertTrue(gravar_se_mudou(caminho, b"geo,taxa\nSpain,1.0\n"))
+            # mtime antigo e conhecido: qualquer reescrita o mudaria.
+            os.utime(caminho, ns=(1_000_000_000, 1_000_000_000))
+            self.assertFalse(gravar_se_mudou(caminho, b"geo,taxa\nSpain,1.0\n"))
+            self.assertEqual(caminho.stat().st_mtime_ns, 1_000_000_000)
+
+            self.assertTrue(gravar_se_mudou(caminho, b"geo,taxa\nSpain,1.1\n"))
+            self.assertNotEqual(caminho.stat().st_mtime_ns, 1_000_000_000)
+            self.assertEqual(caminho.read_bytes(), b"geo,taxa\nSpain,1.1\n")
+            # Sem sobras do arquivo temporario.
+            self.assertEqual([arquivo.name for arquivo in caminho.parent.iterdir()], ["tabela.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
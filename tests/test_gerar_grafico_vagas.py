@@ -0,0 +1,76 @@
+"""Formato longo e series do grafico a partir do XLSX real da Eurostat."""
+
+import argparse
+import sys
+import unittest
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from gerar_grafico_vagas import (  # noqa: E402
+    PAISES_PADRAO,
+    ler_particao,
+    particionar_abas,
+    resolver_abas,
+    series_grafico,
+    tabela_longa_da_matriz,
+)
+from leitor_xlsx import abrir_livro, listar_nomes_abas  # noqa: E402
+
+ARQUIVO_REAL = RAIZ / "data" / "job_vacancies.xlsx"
+
+
+class SeriesCompactoTest(unittest.TestCase):
+    def test_mesma_ordem_com_e_sem_compacto(self) -> None:
+        livro = abrir_livro(ARQUIVO_REAL)
+        comparadas = 0
+        for nome_aba in listar_nomes_abas(ARQUIVO_REAL):
+            matriz = livro.ler_aba(nome_aba)
+            normal = tabela_longa_da_matriz(matriz, compacto=False)
+            if not set(PAISES_PADRAO) & set(normal["geo"]):
+                continue
+            with self.subTest(aba=nome_aba):
+                esperado = series_grafico(normal, PAISES_PADRAO)
+                self.assertEqual(series_grafico(tabela_longa_da_matriz(matriz, compacto=True), PAISES_PADRAO), esperado)
+                self.assertEqual([geo for geo, _, _ in esperado], sorted(geo for geo, _, _ in esperado))
+            comparadas += 1
+        self.assertGreater(comparadas, 0)
+
+
+ABAS = ["Summary", "Sheet 1", "Sheet 2", "Sheet 10", "Sheet 11"]
+
+
+class SelecaoAbasTest(unittest.TestCase):
+    def test_nome_numero_intervalo_e_glob(self) -> None:
+        self.assertEqual(resolver_abas(["Sheet 2"], ABAS), ["Sheet 2"])
+        self.assertEqual(resolver_abas(["1"], ABAS), ["Summary"])
+        self.assertEqual(resolver_abas(["2-4"], ABAS), ["Sheet 1", "Sheet 2", "Sheet 10"])
+        self.assertEqual(resolver_abas(["Sheet 1*"], ABAS), ["Sheet 1", "Sheet 10", "Sheet 11"])
+        self.assertEqual(resolver_abas(["todas"], ABAS), ABAS)
+
+    def test_ordem_do_workbook_sem_repetir(self) -> None:
+        self.assertEqual(resolver_abas(["Sheet 11", "5", "Summary"], ABAS), ["Summary", "Sheet 11"])
+
+    def test_seletores_invalidos(self) -> None:
+        for seletor in ("0", "6", "4-2", "3-9", "Sheet 9*", "Sheet 3"):
+            with self.subTest(seletor=seletor), self.assertRaises(SystemExit):
+                resolver_abas([seletor], ABAS)
+
+
+class ParticaoTest(unittest.TestCase):
+    def test_limites(self) -> None:
+        self.assertEqual(ler_particao("1/1"), (1, 1))
+        self.assertEqual(ler_particao("4/4"), (4, 4))
+        for texto in ("0/4", "5/4", "1/0", "-1/4", "a/b", "2", "1/2/3"):
+            with self.subTest(texto=texto), self.assertRaises(argparse.ArgumentTypeError):
+                ler_particao(texto)
+
+    def test_partes_cobrem_todas_as_abas(self) -> None:
+        partes = [particionar_abas(ABAS, (parte, 3)) for parte in range(1, 4)]
+        self.assertEqual(sorted(aba for parte in partes for aba in parte), sorted(ABAS))
+        self.assertEqual(partes[0], ["Summary", "Sheet 10"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Leitor XML em streaming contra o caminho pandas/openpyxl e contra abas montadas a mao."""
+
+import io
+import sys
+import unittest
+import warnings
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from gerar_grafico_vagas import carregar_tabela_vagas  # noqa: E402
+from leitor_xlsx import abrir_livro, ler_matriz_aba, listar_nomes_abas  # noqa: E402
+
+ARQUIVO_REAL = RAIZ / "data" / "job_vacancies.xlsx"
+NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+
+
+def _celula(referencia: str, texto: str) -> str:
+    return f'<c r="{referencia}" t="inlineStr"><is><t>{texto}</t></is></c>'
+
+
+def _aba(linhas: dict) -> zipfile.ZipFile:
+    """Zip em memoria com uma aba: {numero da linha (1-based): [(coluna, texto)]}."""
+    xml = "".join(
+        f'<row r="{numero}">' + "".join(_celula(f"{coluna}{numero}", texto) for coluna, texto in celulas) + "</row>"
+        for numero, celulas in sorted(linhas.items())
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as arquivo_zip:
+        arquivo_zip.writestr("aba.xml", f"<worksheet {NS}><sheetData>{xml}</sheetData></worksheet>")
+    return zipfile.ZipFile(buffer)
+
+
+CABECALHO = {7: [("C", "Information and communication")], 11: [("A", "TIME"), ("B", "2024-Q1"), ("D", "2024-Q2")]}
+
+
+class ComparacaoPandasTest(unittest.TestCase):
+    """Mesma saida do leitor antigo (pd.read_excel) em todas as abas do XLSX real."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        with warnings.catch_warnings():
+            # O XLSX da Eurostat nao tem estilo padrao; o openpyxl avisa e segue.
+            warnings.simplefilter("ignore", UserWarning)
+            cls.livro_pandas = pd.ExcelFile(ARQUIVO_REAL)
+            cls.brutos = {nome: cls.livro_pandas.parse(nome, header=None) for nome in cls.livro_pandas.sheet_names}
+        cls.nomes = listar_nomes_abas(ARQUIVO_REAL)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.livro_pandas.close()
+
+    def test_tabela_arrumada_igual(self) -> None:
+        for nome_aba in self.nomes:
+            with self.subTest(aba=nome_aba), warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                xml = carregar_tabela_vagas(ARQUIVO_REAL, nome_aba, motor="xml", diretorio_cache=None)
+                antigo = carregar_tabela_vagas(self.livro_pandas, nome_aba, motor="pandas", diretorio_cache=None)
+                pd.testing.assert_frame_equal(xml[0], antigo[0])
+                self.assertEqual(xml[1:], antigo[1:])
+
+    def test_dois_pontos_e_flags_iguais_as_celulas(self) -> None:
+        livro = abrir_livro(ARQUIVO_REAL)
+        for nome_aba in self.nomes:
+            matriz = livro.ler_aba(nome_aba, com_flags=True)
+            if not matriz.geos:
+                continue
+            bruto = self.brutos[nome_aba]
+            cabecalho = bruto.iloc[10]
+            colunas = [idx for idx in range(1, len(cabecalho)) if pd.notna(cabecalho[idx])]
+            # O pandas corta a ultima coluna de flag quando ela esta toda vazia.
+            bruto = bruto.reindex(columns=range(max(colunas, default=0) + 2))
+            bloco = bruto.iloc[12 : 12 + len(matriz.geos)]
+            with self.subTest(aba=nome_aba):
+                self.assertEqual(bloco.iloc[:, 0].tolist(), matriz.geos)
+                valores = bloco.iloc[:, colunas].to_numpy(dtype=object)
+                # ":" (e celula vazia) vira NaN; o resto e o numero da celula.
+                dois_pontos = np.vectorize(lambda celula: celula == ":" or pd.isna(celula))(valores)
+                np.testing.assert_array_equal(np.isnan(matriz.valores), dois_pontos)
+                np.testing.assert_array_equal(matriz.valores[~dois_pontos], valores[~dois_pontos].astype(float))
+                flags = bloco.iloc[:, [coluna + 1 for coluna in colunas]].to_numpy(dtype=object)
+                esperadas = [
+                    [None if pd.isna(flag) or not str(flag).strip() else str(flag).strip() for flag in linha]
+                    for linha in flags
+                ]
+                self.assertEqual(matriz.flags.tolist(), esperadas)
+
+    def test_xlsx_real_tem_dois_pontos_e_flags(self) -> None:
+        matriz = abrir_livro(ARQUIVO_REAL).ler_aba("Sheet 19", com_flags=True)
+        self.assertTrue(np.isnan(matriz.valores).any())
+        self.assertTrue({"b", "p"} <= {flag for flag in matriz.flags.ravel() if flag})
+
+
+class FimDosDadosTest(unittest.TestCase):
+    """Onde o bloco de dados termina e abas sem trimestres."""
+
+    def _ler(self, linhas: dict):
+        return ler_matriz_aba(_aba({**CABECALHO, **linhas}), "aba.xml", [], com_flags=True)
+
+    def test_linha_vazia_explicita(self) -> None:
+        matriz = self._ler({13: [("A", "Spain"), ("B", "1.0")], 14: [], 15: [("A", "b"), ("B", "break")]})
+        self.assertEqual(matriz.geos, ["Spain"])
+
+    def test_linha_ausente_do_xml(self) -> None:
+        matriz = self._ler({13: [("A", "Spain"), ("B", "1.0")], 15: [("A", "p"), ("B", "provisional")]})
+        self.assertEqual(matriz.geos, ["Spain"])
+
+    def test_legenda_special_value(self) -> None:
+        matriz = self._ler(
+            {
+                13: [("A", "Spain"), ("B", "1.0"), ("C", "p"), ("D", ":")],
+                14: [("A", "Special value")],
+                15: [("A", ":"), ("B", "not available")],
+            }
+        )
+        self.assertEqual(matriz.geos, ["Spain"])
+        self.assertEqual(matriz.area, "Information and communication")
+        np.testing.assert_array_equal(matriz.valores, [[1.0, np.nan]])
+        self.assertEqual(matriz.flags.tolist(), [["p", None]])
+
+    def test_aba_sem_trimestres(self) -> None:
+        matriz = ler_matriz_aba(_aba({7: CABECALHO[7], 11: [("A", "TIME")], 13: [("A", "Spain")]}), "aba.xml", [])
+        self.assertEqual(matriz.trimestres, [])
+        self.assertEqual(matriz.geos, ["Spain"])
+        self.assertEqual(matriz.valores.shape, (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Modo lote incremental: o manifesto decide pelo conteudo lido, nao pelos bytes do XLSX."""
+
+import contextlib
+import io
+import re
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from gerar_grafico_vagas import fluxo_lote  # noqa: E402
+from sintetico_vagas import TamanhoSintetico, gerar_xlsx_sintetico  # noqa: E402
+
+
+def _reescrever(caminho: Path, trocas: dict) -> None:
+    """Regrava o XLSX aplicando {parte: funcao(texto) -> texto} nas partes XML."""
+    with zipfile.ZipFile(caminho) as origem:
+        partes = [(info, origem.read(info.filename)) for info in origem.infolist()]
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as destino:
+        for info, conteudo in partes:
+            if info.filename in trocas:
+                conteudo = trocas[info.filename](conteudo.decode("utf-8")).encode("utf-8")
+            destino.writestr(info, conteudo)
+
+
+def _novo_download(texto: str) -> str:
+    return texto.replace("Data extracted on 20/11/2025 01:54:12", "Data extracted on 21/11/2025 02:10:40")
+
+
+class LoteIncrementalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        raiz = Path(self._tmp.name)
+        self.caminho = gerar_xlsx_sintetico(raiz / "vagas.xlsx", TamanhoSintetico(2, 8, 4))
+        self.opcoes = dict(
+            diretorio_cache=raiz / "cache",
+            perfil="previa",
+            diretorio_tabelas=raiz / "tabelas",
+            diretorio_graficos=raiz / "graficos",
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _rodar(self) -> dict:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados = fluxo_lote(self.caminho, ["Sheet 1", "Sheet 2"], **self.opcoes)
+        return {nome_aba: status for nome_aba, status, _ in resultados}
+
+    def test_so_data_da_extracao_mudou(self) -> None:
+        self.assertEqual(self._rodar(), {"Sheet 1": "ok", "Sheet 2": "ok"})
+        # Novo download: A1 muda em todas as abas, os dados so na Sheet 2.
+        _reescrever(
+            self.caminho,
+            {
+                "xl/worksheets/sheet2.xml": _novo_download,
+                "xl/worksheets/sheet3.xml": lambda texto: re.sub(
+                    r'(<c r="B13"[^>]*><is><t>)[^<]*', r"\g<1>99.9", _novo_download(texto)
+                ),
+            },
+        )
+        self.assertEqual(self._rodar(), {"Sheet 1": "inalterada", "Sheet 2": "ok"})
+        self.assertEqual(self._rodar(), {"Sheet 1": "inalterada", "Sheet 2": "inalterada"})
+
+
+    def test_geos_inexistentes(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()) as saida:
+            fluxo_lote(self.caminho, ["Sheet 1"], paises=["Spain", "Nowhere"], **self.opcoes)
+        self.assertIn("nao aparecem em nenhuma aba: Nowhere", saida.getvalue())
+        # Nenhum geo existe: falha, inclusive na segunda rodada (abas inalteradas pelo manifesto).
+        for _ in range(2):
+            with self.subTest(), contextlib.redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+                fluxo_lote(self.caminho, ["Sheet 1"], paises=["Nowhere"], **self.opcoes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Observacao por polling: arquivos alterados depois da foto inicial sao entregues."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from observador_vagas import assinaturas_arquivos, observar_arquivos  # noqa: E402
+
+
+class ObservadorVagasTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.diretorio = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_mudanca_entre_foto_e_observacao_e_entregue(self) -> None:
+        arquivo = self.diretorio / "vagas.xlsx"
+        arquivo.write_bytes(b"versao 1")
+        iniciais = assinaturas_arquivos(self.diretorio)
+        # Alteracao durante a rodada inicial, antes do gerador comecar a vigiar.
+        arquivo.write_bytes(b"versao 2, maior")
+        observador = observar_arquivos(self.diretorio, 0.01, iniciais=iniciais)
+        self.assertEqual(next(observador), arquivo)
+
+    def test_arquivos_da_foto_nao_sao_entregues(self) -> None:
+        (self.diretorio / "vagas.xlsx").write_bytes(b"versao 1")
+        (self.diretorio / "~$vagas.xlsx").write_bytes(b"trava do Excel")
+        iniciais = assinaturas_arquivos(self.diretorio)
+        self.assertEqual(list(iniciais), [self.diretorio / "vagas.xlsx"])
+        novo = self.diretorio / "novo.xlsx"
+        novo.write_bytes(b"chegou depois")
+        observador = observar_arquivos(self.diretorio, 0.01, iniciais=iniciais)
+        self.assertEqual(next(observador), novo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Filtros ?geo, ?de e ?ate do servidor local."""
+
+import http.client
+import sys
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from servidor_vagas import (  # noqa: E402
+    ErroRequisicao,
+    EstadoServidor,
+    _criar_manipulador,
+    _etag_confere,
+    _filtrar,
+)
+
+ARQUIVO_REAL = RAIZ / "data" / "job_vacancies.xlsx"
+
+DADOS = pd.DataFrame(
+    {
+        "geo": ["Spain", "Spain", "France", "France"],
+        "trimestre": ["2024-Q1", "2024-Q2", "2024-Q1", "2024-Q2"],
+        "taxa_vaga": [0.9, 1.0, 2.1, 2.0],
+    }
+)
+
+
+class FiltrarTest(unittest.TestCase):
+    def test_intervalo_e_geo(self) -> None:
+        recorte, trimestres, geos = _filtrar(DADOS, ["2024-Q1", "2024-Q2"], {"geo": ["Spain"], "de": ["2024-Q2"]})
+        self.assertEqual(trimestres, ["2024-Q2"])
+        self.assertEqual(geos, ["Spain"])
+        self.assertEqual(recorte["taxa_vaga"].tolist(), [1.0])
+
+    def test_trimestre_fora_da_aba(self) -> None:
+        with self.assertRaises(ErroRequisicao) as erro:
+            _filtrar(DADOS, ["2024-Q1", "2024-Q2"], {"ate": ["2030-Q1"]})
+        self.assertEqual(erro.exception.status, 400)
+
+    def test_intervalo_invertido(self) -> None:
+        with self.assertRaises(ErroRequisicao) as erro:
+            _filtrar(DADOS, ["2024-Q1", "2024-Q2"], {"de": ["2024-Q2"], "ate": ["2024-Q1"]})
+        self.assertEqual(erro.exception.status, 400)
+
+    def test_aba_sem_trimestres(self) -> None:
+        vazia = DADOS.iloc[0:0]
+        for parametros in ({"de": ["2024-Q1"]}, {"ate": ["2024-Q1"]}):
+            with self.assertRaises(ErroRequisicao) as erro:
+                _filtrar(vazia, [], parametros)
+            self.assertEqual(erro.exception.status, 400)
+            self.assertIn("nao tem trimestres", str(erro.exception))
+        recorte, trimestres, _ = _filtrar(vazia, [], {})
+        self.assertTrue(recorte.empty)
+        self.assertEqual(trimestres, [])
+
+
+class EtagTest(unittest.TestCase):
+    def test_if_none_match(self) -> None:
+        etag = '"abc"'
+        self.assertTrue(_etag_confere('"abc"', etag))
+        self.assertTrue(_etag_confere('W/"abc"', etag))
+        self.assertTrue(_etag_confere('"x", W/"abc" , "y"', etag))
+        self.assertTrue(_etag_confere("*", etag))
+        self.assertFalse(_etag_confere('"abcd"', etag))
+        self.assertFalse(_etag_confere(None, etag))
+        self.assertFalse(_etag_confere("", etag))
+
+
+class ServidorHttpTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.estado = EstadoServidor(ARQUIVO_REAL)
+        cls.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _criar_manipulador(cls.estado))
+        cls.thread = threading.Thread(target=cls.servidor.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+        cls.estado.fechar()
+
+    def _pedir(self, metodo: str, caminho: str, cabecalhos: dict | None = None) -> tuple:
+        conexao = http.client.HTTPConnection(*self.servidor.server_address, timeout=30)
+        try:
+            conexao.request(metodo, caminho, headers=cabecalhos or {})
+            resposta = conexao.getresponse()
+            return resposta.status, dict(resposta.getheaders()), resposta.read()
+        finally:
+            conexao.close()
+
+    def test_head_igual_ao_get_sem_corpo(self) -> None:
+        status_get, cabecalhos_get, corpo_get = self._pedir("GET", "/abas")
+        status_head, cabecalhos_head, corpo_head = self._pedir("HEAD", "/abas")
+        self.assertEqual((status_get, status_head), (200, 200))
+        self.assertEqual(cabecalhos_head["ETag"], cabecalhos_get["ETag"])
+        self.assertEqual(cabecalhos_head["Content-Length"], str(len(corpo_get)))
+        self.assertEqual(corpo_head, b"")
+
+    def test_304_com_validador_fraco_e_lista(self) -> None:
+        _, cabecalhos, _ = self._pedir("GET", "/abas")
+        for valor in (f"W/{cabecalhos['ETag']}", f'"outro", {cabecalhos["ETag"]}'):
+            status, _, corpo = self._pedir("GET", "/abas", {"If-None-Match": valor})
+            self.assertEqual((status, corpo), (304, b""))
+
+    def test_intervalo_invertido_400(self) -> None:
+        status, _, _ = self._pedir("GET", "/abas/sheet_19.json?de=2025-Q1&ate=2024-Q1")
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()